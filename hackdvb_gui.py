@@ -6,14 +6,232 @@ import subprocess
 import os
 import sys
 import threading
+import signal
+import selectors
+import codecs
+import io
+import atexit
 import re
 import queue
+from functools import partial, lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
 import shutil
 import webbrowser
+from types import MappingProxyType
 from datetime import datetime, timedelta
 import xml.sax.saxutils
 import xml.etree.ElementTree as ET
+try:
+    import orjson # Optional: much faster JSON parsing and serialization
+except ImportError:
+    orjson = None
+
+# Both parsers accept bytes, so subprocess output can be passed through undecoded.
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps_pretty(obj):
+    """Serializes obj to indented UTF-8 JSON bytes."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8') # Same layout as orjson's output
+
+_EMPTY_TAGS = MappingProxyType({}) # Shared read-only default for ffprobe streams without tags
+
+_INPUT_TYPES = ("Concat File", "Single Media File", "Playlist", "UDP/IP Stream")
+
+def _quote_arg(arg):
+    """Quotes a command-line argument containing spaces for display."""
+    return f'"{arg}"' if ' ' in arg else arg
+
+# Constant ffmpeg argument runs shared by every channel's input options
+_LOOP_ARGS = ("-stream_loop", "-1")
+_CONCAT_INPUT_ARGS = ("-f", "concat", "-safe", "0", "-i")
+
+# Escapes colons in a subtitle path for use inside the subtitles filter
+_SUB_COLON_TABLE = str.maketrans({":": "\\:"})
+# FFmpeg concat format requires forward slashes and escaped single quotes
+_CONCAT_PATH_TABLE = str.maketrans({"\\": "/", "'": "'\\''"})
+
+# Subtitle ripper output format -> ffmpeg subtitle encoder name
+_SUBTITLE_CODEC_MAP = MappingProxyType({"srt": "srt", "ass": "ass", "vtt": "webvtt"})
+
+# Media tools report progress on stdout once a second (ffmpeg's default is every 0.5 s)
+_TOOL_PROGRESS_ARGS = ('-progress', 'pipe:1', '-stats_period', '1')
+
+# Matches a complete out_time_ms line of ffmpeg's -progress output. "N/A" and the negative
+# placeholder some builds print before the first frame don't match.
+_PROGRESS_RE = re.compile(rb'^out_time_ms=(\d+)\r?$', re.MULTILINE)
+
+# Matches the frame rate part (e.g. " @ 25 fps") of a video format's display text
+_FR_RE = re.compile(r'\s*@\s*[\d\.]+\s*fps')
+
+# Matches a concat list entry of the form "file '/path/to/media.mkv'"
+_CONCAT_LINE_RE = re.compile(r"file\s+'(.+?)'")
+
+def _fast_parse_dt(text):
+    """
+    Parses a "YYYY-MM-DD HH:MM:SS" timestamp. The zero-padded layout TSDuck writes is sliced, which
+    is much faster than strptime; anything else (e.g. "2025-01-02 3:04:05" in hand-edited XML) falls
+    back to strptime. Raises ValueError if invalid.
+    """
+    if len(text) == 19 and text[4] == '-' and text[7] == '-' and text[10] == ' ' and text[13] == ':' and text[16] == ':':
+        try:
+            return datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]), int(text[11:13]), int(text[14:16]), int(text[17:19]))
+        except ValueError:
+            pass # Let strptime decide
+    return datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+
+def _parse_dt(date_str, time_str):
+    """
+    Parses the EPG forms' "YYYY-MM-DD" date and "HH:MM" time into a datetime without strptime.
+    Like strptime, single-digit fields (e.g. "9:05") are accepted. Raises ValueError if invalid.
+    """
+    date_parts = date_str.split('-')
+    time_parts = time_str.split(':')
+    if len(date_parts) != 3 or len(time_parts) != 2:
+        raise ValueError(f"'{date_str} {time_str}' does not match the format YYYY-MM-DD HH:MM")
+    year, month, day = date_parts
+    hour, minute = time_parts
+    return datetime(int(year), int(month), int(day), int(hour), int(minute))
+
+def _fast_parse_duration(text):
+    """
+    Parses an "HH:MM:SS" duration (as in EIT XML) into a timedelta. The zero-padded layout is
+    sliced; other forms such as "1:30:00" are split on the colons. Raises ValueError if invalid.
+    """
+    if len(text) == 8 and text[2] == ':' and text[5] == ':':
+        return timedelta(seconds=int(text[0:2]) * 3600 + int(text[3:5]) * 60 + int(text[6:8]))
+    h, m, s = map(int, text.split(':'))
+    return timedelta(hours=h, minutes=m, seconds=s)
+
+# EPG editor form: (row, label, sticky) for the label column, and (row, tooltip) for its
+# plain text entry rows. The remaining rows have composite widgets and are built by hand.
+_EPG_FORM_LABELS = (
+    (0, "Channel:", "w"),
+    (1, "Title:", "w"),
+    (2, "Short Desc:", "w"),
+    (3, "Language:", "w"),
+    (4, "Start Time:", "w"),
+    (5, "Duration:", "w"),
+    (6, "Extended Desc:", "nw"),
+    (7, "Content Type:", "w"),
+    (8, "Parental Rating:", "w"),
+)
+_EPG_FORM_ENTRIES = (
+    (1, "The main title of the event."),
+    (2, "A brief, one-line summary of the event."),
+)
+
+# DVB content descriptor nibbles (EN 300 468): level 1 categories and their level 2 sub-categories
+_L1_CATEGORIES = {
+    0x0: "Reserved for future use",
+    0x1: "Movie/Cinema",
+    0x2: "News/Current Affairs",
+    0x3: "Show/Entertainment",
+    0x4: "Sport",
+    0x5: "Children's/Youth Programs",
+    0x6: "Music/Ballet/Dance",
+    0x7: "Arts/Culture",
+    0x8: "Social/Political Issues/Economics",
+    0x9: "Education/Science/Factual Topics",
+    0xA: "Leisure/Hobbies",
+    0xB: "Special Characteristics",
+    0xC: "Adult Programs",
+    0xD: "User Defined",
+    0xE: "User Defined",
+    0xF: "User Defined"
+}
+_L2_CATEGORIES = { 0x1: { 0x0: "Movie/Cinema (default)", 0x1: "Detective/Thriller", 0x2: "Adventure/Western", 0x3: "Sci-Fi/Fantasy", 0x4: "Comedy", 0x5: "Serious/Classical/Drama", 0x6: "Documentary", 0x7: "Various" }, 0x2: { 0x0: "News/Current Affairs (default)", 0x1: "News/Weather Report", 0x2: "News Magazine", 0x3: "Documentary/Reportage", 0x4: "Discussion/Interview/Debate", 0x5: "Various" }, 0x3: { 0x0: "Show/Entertainment (default)", 0x1: "Game Show/Quiz/Contest", 0x2: "Variety Show", 0x3: "Talk Show", 0x4: "Various" }, 0x4: { 0x0: "Sport (default)", 0x1: "Special Event (Olympics, World Cup)", 0x2: "Soccer/Football", 0x3: "Tennis/Squash", 0x4: "Team Sports (other)", 0x5: "Athletics", 0x6: "Motor Sport", 0x7: "Water Sport", 0x8: "Winter Sport", 0x9: "Horse Racing", 0xA: "Cycling", 0xB: "Various" }, 0x5: { 0x0: "Children's/Youth (default)", 0x1: "Pre-school", 0x2: "Entertainment (6-14 years)", 0x3: "Factual (6-14 years)", 0x4: "Young Teenagers", 0x5: "Teenagers", 0x6: "Various" }, 0x6: { 0x0: "Music/Ballet/Dance (default)", 0x1: "Rock/Pop", 0x2: "Serious Music (Classical)", 0x3: "Jazz", 0x4: "Musical/Opera", 0x5: "Folk/Traditional Music", 0x6: "Various" }, 0x7: { 0x0: "Arts/Culture (default)", 0x1: "Performing Arts", 0x2: "Fine Arts", 0x3: "Religion/Mythology/Folklore", 0x4: "Experimental Cinema/Video", 0x5: "Broadcasting/Press", 0x6: "New Media", 0x7: "Various/Feuilleton/Serial" }, 0x8: { 0x0: "Social/Political (default)", 0x1: "Magazines/Reports/Documentary", 0x2: "Discussion/Interview/Debate", 0x3: "Various" }, 0x9: { 0x0: "Education/Science (default)", 0x1: "Nature/Animals/Environment", 0x2: "Technology/Natural Sciences", 0x3: "Medicine/Health/Well Being", 0x4: "Foreign Countries/Expeditions", 0x5: "Various" }, 0xA: { 0x0: "Leisure/Hobbies (default)", 0x1: "Gardening", 0x2: "Cooking/Haute Cuisine", 0x3: "Travel/Tourism", 0x4: "Handicraft", 0x5: "Motoring", 0x6: "Fitness/Health", 0x7: "Various" }, 0xB: { 0x0: "Special Characteristics (default)", 0x1: "Adult Material/Pornography (deprecated)", 0x2: "Black and White", 0x3: "Unedited", 0x4: "Live Broadcast", 0x5: "Original Language", 0x6: "Explicit" }, 0xC: { 0x0: "Adult Programs/Pornography (default)" } }
+# Rows of the nibble reference dialog, formatted once: (iid, value text, description)
+_L1_ROWS = tuple((val, f"{val} (0x{val:X})", desc) for val, desc in _L1_CATEGORIES.items())
+_L2_ROWS = {l1_val: tuple((f"{val} (0x{val:X})", desc) for val, desc in sub_cats.items()) for l1_val, sub_cats in _L2_CATEGORIES.items()}
+
+# Constant fields of the "To Be Announced" events that fill gaps in a channel's schedule.
+# Each filler is a copy of this with its channel, start and end added.
+_FILLER_TEMPLATE = MappingProxyType({
+    "title": "To Be Announced",
+    "language": "eng",
+    "short_desc": "Information not available.",
+    "ext_desc": "",
+    "nibble1": 15, "nibble2": 0, "ca_mode": False,
+    "country_code": "gbr", "min_age": "None"
+})
+
+# EIT XML templates for one event, filled with %-formatting. The optional descriptors are
+# inserted between the head and _EVENT_XML_TAIL.
+_EVENT_XML_HEAD = (
+    '    <event event_id="%s" start_time="%s" duration="%s" running_status="%s" CA_mode="%s">\n'
+    '      <content_descriptor>\n'
+    '        <content content_nibble_level_1="%s" content_nibble_level_2="%s" user_byte="0x00"/>\n'
+    '      </content_descriptor>\n'
+    '      <short_event_descriptor language_code="%s">\n'
+    '        <event_name>%s</event_name>\n'
+    '        <text>%s</text>\n'
+    '      </short_event_descriptor>\n'
+)
+_PARENTAL_XML = (
+    '      <parental_rating_descriptor>\n'
+    '        <country country_code="%s" rating="0x%02X"/>\n'
+    '      </parental_rating_descriptor>\n'
+)
+_EXT_DESC_XML = (
+    '      <extended_event_descriptor descriptor_number="0" last_descriptor_number="0" language_code="%s">\n'
+    '        <text>%s</text>\n'
+    '      </extended_event_descriptor>\n'
+)
+_EVENT_XML_TAIL = '    </event>'
+
+# Titles and descriptions repeat heavily across a schedule (series names, filler text),
+# so each distinct string is only escaped once.
+_xml_escape = lru_cache(maxsize=8192)(xml.sax.saxutils.escape)
+
+# Shared STARTUPINFO that hides the console window of spawned tools on Windows.
+_STARTUPINFO = None
+if os.name == 'nt':
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+# Popen options for processes stopped with terminate_process_tree(). On POSIX the child
+# leads its own process group so the whole group can be signalled at once.
+if os.name == 'nt':
+    _TREE_POPEN_KWARGS = {"startupinfo": _STARTUPINFO, "creationflags": subprocess.CREATE_NO_WINDOW}
+else:
+    _TREE_POPEN_KWARGS = {"start_new_session": True}
+
+def terminate_process_tree(process):
+    """Terminates a process started with _TREE_POPEN_KWARGS along with any children it spawned."""
+    if process.poll() is not None:
+        return # Already finished
+    if os.name == 'nt':
+        # taskkill /T walks the child processes that TerminateProcess would leave behind
+        result = subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)], capture_output=True, startupinfo=_STARTUPINFO)
+        if result.returncode != 0:
+            process.kill()
+    else:
+        os.killpg(process.pid, signal.SIGTERM) # The pid is also the group id (start_new_session)
+
+class LogLineDecoder:
+    """Incrementally decodes UTF-8 output chunks into complete lines."""
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.pending = "" # Unterminated text carried over to the next chunk
+
+    def feed(self, chunk):
+        """Returns the lines completed by chunk. An empty chunk marks the end of the stream."""
+        text = self.pending + self.decoder.decode(chunk, final=not chunk)
+        # A trailing "\r" may be the first half of a "\r\n" split across reads
+        held = "\r" if chunk and text.endswith("\r") else ""
+        if held:
+            text = text[:-1]
+        # ffmpeg redraws its progress line with "\r", so treat it as a line break
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        self.pending = lines.pop() + held
+        if not chunk and self.pending:
+            lines.append(self.pending)
+            self.pending = ""
+        return lines
 
 class TextContextMenu:
     """A class to add a right-click context menu to Text and Entry widgets."""
@@ -45,6 +263,35 @@ class TextContextMenu:
     def paste(self):
         self.master.event_generate("<<Paste>>")
 
+_TS_PIPE_SIZE = 1 << 20 # 1 MiB kernel buffer between ffmpeg and tsp
+_F_SETPIPE_SZ = 1031 # Linux fcntl command, not exported by the fcntl module on older Pythons
+
+def create_ts_pipe(size=_TS_PIPE_SIZE):
+    """
+    Creates an OS pipe with an enlarged buffer for the ffmpeg -> tsp transport stream.
+    Returns (read_fd, write_fd). Falls back to the default pipe size if it can't be changed.
+    """
+    if os.name == 'nt':
+        import _winapi
+        import msvcrt
+        read_handle, write_handle = _winapi.CreatePipe(None, size)
+        return msvcrt.open_osfhandle(read_handle, os.O_RDONLY), msvcrt.open_osfhandle(write_handle, 0)
+
+    read_fd, write_fd = os.pipe()
+    try:
+        import fcntl
+        fcntl.fcntl(write_fd, getattr(fcntl, 'F_SETPIPE_SZ', _F_SETPIPE_SZ), size)
+    except (ImportError, OSError):
+        pass # Not Linux, or the size exceeds /proc/sys/fs/pipe-max-size
+    return read_fd, write_fd
+
+def remove_file_quietly(path):
+    """Deletes a file, ignoring errors (e.g. when it was already cleaned up)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
 def make_readonly(widget):
     """Makes a text widget read-only but allows selection and copying."""
     widget.bind("<KeyPress>", lambda e: "break")
@@ -52,61 +299,105 @@ def make_readonly(widget):
 class ToolTip:
     """
     Create a tooltip for a given widget.
+    Only the text is stored per widget. All tooltips share one set of application-wide
+    bindings, and the tooltip window is built when the pointer rests on a widget.
     """
+    _texts = {}             # Widget path name -> tooltip text
+    _installed = False      # Whether the shared bindings have been set up
+    _widget = None          # Widget whose tooltip is pending or shown
+    _after_id = None
+    _tooltip_window = None
+
     def __init__(self, widget, text):
-        self.widget = widget
-        self.text = text
-        self.tooltip_window = None
-        self.id = None
-        self.x = self.y = 0
-        self.widget.bind("<Enter>", self.enter)
-        self.widget.bind("<Leave>", self.leave)
-
-    def enter(self, event=None):
-        self.schedule()
-
-    def leave(self, event=None):
-        self.unschedule()
-        self.hidetip()
-
-    def schedule(self):
-        self.unschedule()
-        self.id = self.widget.after(500, self.showtip)
-
-    def unschedule(self):
-        id = self.id
-        self.id = None
-        if id:
-            self.widget.after_cancel(id)
-
-    def showtip(self, event=None):
+        ToolTip._texts[str(widget)] = text
+        if not ToolTip._installed:
+            ToolTip._installed = True
+            widget.bind_all("<Enter>", ToolTip._on_enter, add="+")
+            widget.bind_all("<Leave>", ToolTip._on_leave, add="+")
+            widget.bind_all("<Destroy>", ToolTip._on_destroy, add="+")
+
+    @classmethod
+    def _on_enter(cls, event):
+        if str(event.widget) not in cls._texts:
+            return
+        cls._unschedule()
+        cls._hidetip()
+        cls._widget = event.widget
+        cls._after_id = event.widget.after(500, cls._showtip)
+
+    @classmethod
+    def _on_leave(cls, event):
+        if cls._widget is not None and str(event.widget) == str(cls._widget):
+            cls._unschedule()
+            cls._hidetip()
+            cls._widget = None
+
+    @classmethod
+    def _on_destroy(cls, event):
+        # Forget the text of destroyed widgets so removed channels/dialogs don't accumulate
+        if cls._texts.pop(str(event.widget), None) is not None and cls._widget is event.widget:
+            cls._unschedule()
+            cls._hidetip()
+            cls._widget = None
+
+    @classmethod
+    def _unschedule(cls):
+        after_id = cls._after_id
+        cls._after_id = None
+        if after_id:
+            try:
+                cls._widget.after_cancel(after_id)
+            except tk.TclError:
+                pass
+
+    @classmethod
+    def _showtip(cls):
+        cls._after_id = None
+        widget = cls._widget
+        text = cls._texts.get(str(widget))
+        if widget is None or text is None:
+            return
         x = y = 0
         try:
             # For widgets like Entry, Text with an insert cursor
-            x, y, cx, cy = self.widget.bbox("insert")
-            x += self.widget.winfo_rootx() + 25
-            y += self.widget.winfo_rooty() + 20
+            x, y, cx, cy = widget.bbox("insert")
+            x += widget.winfo_rootx() + 25
+            y += widget.winfo_rooty() + 20
         except (tk.TclError, TypeError):
             # For other widgets, position relative to the mouse pointer
-            x = self.widget.winfo_pointerx() + 15
-            y = self.widget.winfo_pointery() + 10
-        self.tooltip_window = tw = tk.Toplevel(self.widget)
+            x = widget.winfo_pointerx() + 15
+            y = widget.winfo_pointery() + 10
+        cls._tooltip_window = tw = tk.Toplevel(widget)
         tw.wm_overrideredirect(True)
         tw.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(tw, text=self.text, justify='left',
+        label = tk.Label(tw, text=text, justify='left',
                        background="#ffffe0", relief='solid', borderwidth=1,
                        font=("tahoma", "8", "normal"))
         label.pack(ipadx=1)
 
-    def hidetip(self):
-        tw = self.tooltip_window
-        self.tooltip_window = None
+    @classmethod
+    def _hidetip(cls):
+        tw = cls._tooltip_window
+        cls._tooltip_window = None
         if tw:
             tw.destroy()
 
 class HackDvbGui(tk.Tk):
     APP_VERSION = "beta 1.00"
 
+    # Modulation constants used by calculate_mux_rate
+    _BITS_PER_SYMBOL = {
+        "DVB-S2-QPSK": 2,
+        "DVB-S2-8PSK": 3,
+        "DVB-S2-16APSK": 4,
+        "DVB-S2-32APSK": 5
+    }
+    _RS_OVERHEAD = 188 / 204 # DVB-S Reed-Solomon (204,188)
+    _TOOL_LOG_MAX_LINES = 5000 # ffmpeg's stderr over a long batch would otherwise grow the log without bound
+    _EPG_TREE_PAGE = 200 # EPG editor rows inserted at a time; more are added as the list is scrolled
+    _PROBE_TIMEOUT = 30 # Seconds; a live input with no data would otherwise hold a probe worker forever
+    _HW_PROBE_TIMEOUT = 20 # Seconds per hardware detection command (encoder list, dry runs, nvidia-smi)
+
     def __init__(self):
         super().__init__()
         self.withdraw() # Hide main window until dependencies are checked
@@ -117,6 +408,11 @@ class HackDvbGui(tk.Tk):
         self.tsp_path = tk.StringVar(value="tsp")
         self.tdt_path = tk.StringVar(value="tdt.exe")
         self.analysis_file_path = tk.StringVar(value="") # Path for the tsp analyze plugin output
+        self._ffprobe_exe = None # Resolved lazily from ffmpeg_path, reset whenever it changes
+        self._probe_cache = OrderedDict() # (abspath, mtime_ns, size) -> ffprobe format and streams data, most recent last
+        self._probe_cache_size = 4096 # Entries are small (only the fields we use), so whole batches and playlists fit
+        self._probe_cache_lock = threading.Lock() # Probes run on several worker threads
+        self.ffmpeg_path.trace_add("write", self._invalidate_ffprobe_cache)
 
         # --- Persistent Settings File ---
         self._initialize_settings_path() # This will find or set the settings file path
@@ -135,6 +431,16 @@ class HackDvbGui(tk.Tk):
 
         self.cuda_supported = False # Will be determined after dependency check
         self.qsv_supported = False  # Will be determined after dependency check
+        self.cuda_device_count = 1  # Number of CUDA GPUs, updated by detect_hw_support
+        self._fec_cache = {} # FEC string (e.g. "3/4") -> code rate
+        self._preview_after_id = None # Pending debounced command preview update
+        self._cmd_dirty = True # Set when a setting changed since the preview was last built
+        self._tsp_cmd_key = None # Settings the cached tsp command was built from
+        self._tsp_cmd_cached = None
+        self._preview_text = None # Text currently shown in the command preview
+        self._loading_project = False # Set while apply_configuration restores a project
+        self._last_mux_text = None # Text currently shown by mux_rate_mbps_label
+        self._mux_after_id = None     # Pending debounced mux rate calculation
         self.process = None
         self.log_queue = queue.Queue()
         self.country_code_map = { # ISO 3166-1 alpha-3
@@ -187,10 +493,27 @@ class HackDvbGui(tk.Tk):
             "ven": "Venezuela", "vnm": "Viet Nam", "vgb": "Virgin Islands (British)", "vir": "Virgin Islands (U.S.)",
             "wlf": "Wallis and Futuna", "esh": "Western Sahara", "yem": "Yemen", "zmb": "Zambia", "zwe": "Zimbabwe"
         }
+        # "CODE - Name" dropdown values for the EPG dialogs; the map never changes at runtime
+        self._country_display_list = tuple(sorted([f"{code.upper()} - {name}" for code, name in self.country_code_map.items()]))
         self.tdt_process = None
         self.channels = []
-        self.tool_process = None
+        self._channel_by_frame = {} # id(service_frame) -> index into self.channels
+        self._pid_to_channel_name = None # Service ID -> channel name, built on demand and reset when either changes
+        self._temp_concat_paths = set() # Playlist concat files still on disk, removed at exit if not before
+        atexit.register(self._remove_temp_concat_files) # Once; the set tracks the paths
+        self._probe_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ffprobe") # Reused for all probes
+        self.tool_processes = set() # Running media tool ffmpeg processes
+        self._tool_cancel = threading.Event() # Set to stop starting further media tool jobs
+        # Tool and TDT processes run in their own session (see _TREE_POPEN_KWARGS), so they don't
+        # die with the GUI's terminal or process group; stop them whenever the interpreter exits.
+        atexit.register(self._terminate_tree_processes)
+        self._tool_progress_pending = False # A progress bar update is queued on the event loop
+        self._tool_log_inserts = 0 # Counts tool log inserts between size checks
+        self._tool_log_queue = queue.SimpleQueue() # Messages from tool threads awaiting the next flush
+        self._tool_log_flush_pending = False
+        self._latest_tool_progress = (0, 1)
         self.epg_events = [] # To store EPG event data
+        self._epg_titles_lc = None # Lowercased titles parallel to epg_events for the editor filter; None = rebuild
 
         self.subtitle_size_map = {
             "Small": "18",
@@ -198,6 +521,7 @@ class HackDvbGui(tk.Tk):
             "Large": "36",
             "X-Large": "48"
         }
+        self._subtitle_size_values = tuple(self.subtitle_size_map) # Shared combobox values
 
         # Register validation commands
         self.numeric_validate_cmd = self.register(self._validate_numeric_input)
@@ -390,6 +714,8 @@ class HackDvbGui(tk.Tk):
 
         _, video_bitrate_entry, self.video_bitrate = self.create_text_input_widgets(encoding_frame, "Video Bitrate (k):", 0, "6000", validation_type="numeric")
         ToolTip(video_bitrate_entry, "Target video bitrate in kilobits per second (kbps) for each service.\nHigher values improve quality but use more of the total Mux Rate.\nExample: 6000 for 6 Mbps.")
+        self.video_bitrate.trace_add("write", self._recompute_bitrate_strings)
+        self._recompute_bitrate_strings()
 
         # The audio bitrate input was moved to the new Audio Encoding frame.
         # We can hide the now-empty row to keep the layout clean.
@@ -423,6 +749,10 @@ class HackDvbGui(tk.Tk):
                 "default_bitrate": "224"
             }
         }
+        # Frozen copies of the option lists for constant-time membership checks
+        for options in self.audio_options_map.values():
+            options["bitrates_set"] = frozenset(options["bitrates"])
+            options["samplerates_set"] = frozenset(options["samplerates"])
         default_codec = "mp2"
         _, self.audio_codec_combobox, self.audio_codec = self.create_combobox_input_widgets(audio_opts_frame, "Audio Codec:", 0, default_codec, list(self.audio_options_map.keys()))
         self.audio_codec.trace_add("write", self.update_audio_options)
@@ -486,6 +816,8 @@ class HackDvbGui(tk.Tk):
             "Ukrainian": "ukr",
             "Undetermined": "und"
         }
+        self._lang_display_names = tuple(sorted(self.language_map)) # Dropdown values for the EPG dialogs
+        self._lang_code_to_display = {code: name for name, code in self.language_map.items()} # Inverse lookup for loading events
         # Sort languages alphabetically but keep "Undetermined" at the end
         sorted_langs = sorted([lang for lang in self.language_map.keys() if lang != "Undetermined"])
         sorted_langs.append("Undetermined")
@@ -533,6 +865,13 @@ class HackDvbGui(tk.Tk):
                 "hevc_qsv",
             ]
         }
+        # Replacement codec when switching encoder type, looked up by exact codec name, then by suffix.
+        self._codec_remap = {
+            "cuda": {"libx264": "h264_nvenc", "libx265": "hevc_nvenc", "_qsv": "h264_nvenc"},
+            "qsv": {"libx264": "h264_qsv", "libx265": "hevc_qsv", "_nvenc": "h264_qsv"},
+            "software": {"_nvenc": "libx264", "_qsv": "libx265"},
+        }
+        self._default_codec = {"cuda": "h264_nvenc", "qsv": "h264_qsv", "software": "mpeg2video"}
         self.preset_map = {
             "software": [
                 "ultrafast", "superfast", "veryfast", "faster", "fast",
@@ -545,6 +884,8 @@ class HackDvbGui(tk.Tk):
                 "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"
             ]
         }
+        self.video_codec_set_map = {k: frozenset(v) for k, v in self.video_codec_map.items()}
+        self.preset_set_map = {k: frozenset(v) for k, v in self.preset_map.items()}
 
         default_video_codec = "mpeg2video"
         _, self.video_codec_combobox, self.video_codec = self.create_combobox_input_widgets(video_opts_frame, "Video Codec:", 1, default_video_codec, self.video_codec_map["software"])
@@ -554,6 +895,17 @@ class HackDvbGui(tk.Tk):
         _, self.preset_combobox, self.preset = self.create_combobox_input_widgets(video_opts_frame, "Codec Preset:", 2, default_preset, self.preset_map["software"])
         ToolTip(self.preset_combobox, "A trade-off between encoding speed and quality/efficiency.\n- Faster presets use less CPU/GPU but result in lower quality.\n- Slower presets use more resources for better quality.\n'medium' or 'p4' is a good starting point.")
 
+        # Encoder threads for the software x264/x265 encoders, shown next to the preset
+        self.preset_combobox.grid_configure(columnspan=1)
+        threads_frame = ttk.Frame(video_opts_frame)
+        threads_frame.grid(row=2, column=2, sticky='e', padx=(10, 0))
+        ttk.Label(threads_frame, text="Threads:").pack(side=tk.LEFT, padx=(0, 5))
+        self.encoder_threads = tk.StringVar(value="Auto")
+        threads_combobox = ttk.Combobox(threads_frame, textvariable=self.encoder_threads, values=["Auto"] + [str(n) for n in range(1, (os.cpu_count() or 1) + 1)], state="readonly", width=6)
+        threads_combobox.pack(side=tk.LEFT)
+        threads_combobox.bind("<<ComboboxSelected>>", lambda e: self.update_command_preview())
+        ToolTip(threads_combobox, "Number of CPU threads used by the libx264/libx265 software encoders.\n'Auto' uses all CPU cores. libx264 uses sliced threading for low latency.\nHas no effect on hardware (NVENC/QSV) or other software encoders.")
+
         # Pixel Format
         self.pix_fmt_options = ["yuv420p", "yuv422p", "yuv420p10le", "yuv422p10le"]
         default_pix_fmt = "yuv420p"
@@ -675,6 +1027,8 @@ class HackDvbGui(tk.Tk):
         self.main_paned_window.add(self.bottom_pane_container, weight=1)
         self.bottom_pane_container.grid_columnconfigure(0, weight=1)
         self.bottom_pane_container.grid_rowconfigure(0, weight=1)
+        # The pane is hidden on the Tools tab; catch up on preview updates skipped meanwhile
+        self.bottom_pane_container.bind("<Map>", self._on_bottom_pane_mapped)
 
         # This PanedWindow is now inside the bottom_pane_container
         paned_window = ttk.PanedWindow(self.bottom_pane_container, orient=tk.VERTICAL)
@@ -687,7 +1041,7 @@ class HackDvbGui(tk.Tk):
         cmd_pane_frame.grid_columnconfigure(0, weight=1)
 
         cmd_header_frame = self.create_section_header(cmd_pane_frame, "Generated Command")
-        self.preview_button = ttk.Button(cmd_header_frame, text="Preview Command", command=self.update_command_preview, style="Toolbutton")
+        self.preview_button = ttk.Button(cmd_header_frame, text="Preview Command", command=partial(self._do_update_command_preview, force=True), style="Toolbutton")
         ToolTip(self.preview_button, "Manually refresh the FFmpeg and TSDuck command preview below.")
 
         self.export_command_button = ttk.Button(cmd_header_frame, text="Export...", command=self.export_command, style="Toolbutton")
@@ -768,6 +1122,11 @@ class HackDvbGui(tk.Tk):
             if not is_visible:
                 self.main_paned_window.add(self.bottom_pane_container, weight=1)
 
+    def _on_bottom_pane_mapped(self, event):
+        """Refreshes the command preview if settings changed while it was hidden."""
+        if event.widget is self.bottom_pane_container and self._cmd_dirty:
+            self.update_command_preview()
+
     def _initialize_settings_path(self):
         """
         Determines the path for the settings file.
@@ -1051,6 +1410,8 @@ class HackDvbGui(tk.Tk):
         missing_deps_names = []
         if not self._check_and_update_executable_path(self.ffmpeg_path, "FFmpeg"):
             missing_deps_names.append("FFmpeg")
+        else:
+            self.detect_hw_support()
         if not self._check_and_update_executable_path(self.tsp_path, "TSDuck (tsp)"):
             missing_deps_names.append("TSDuck (tsp)")
         if not self._check_and_update_executable_path(self.tdt_path, "TDT Injector (tdt.exe)", check_app_dir=True):
@@ -1082,6 +1443,8 @@ class HackDvbGui(tk.Tk):
             path_var.set(filepath)
             self.log_message(f"Set {name} path to: {filepath}\n")
             self._save_persistent_settings() # Save the new path automatically
+            if path_var is self.ffmpeg_path:
+                self.detect_hw_support() # A different ffmpeg build may have different encoders
             self.update_command_preview()
             return True
         return False
@@ -1389,8 +1752,16 @@ class HackDvbGui(tk.Tk):
         # Sort the topics for the listbox, keeping the technology section together
         tech_topic_keys = ["FFmpeg", "TSDuck", "DekTec Hardware", "DVB-S vs DVB-S2", "TDT Injector"]
         # Explicitly put "Welcome" first, then other main topics, then the technology section.
-        main_topics = ["Welcome"] + sorted([t for t in wiki_content if not t.startswith("---") and t != "Welcome" and t not in tech_topic_keys])
-        tech_topics = sorted([t for t in wiki_content if t.startswith("---") or t in tech_topic_keys])
+        main_topics, tech_topics = [], []
+        tech_topic_set = set(tech_topic_keys)
+        for t in wiki_content:
+            if t.startswith("---") or t in tech_topic_set:
+                tech_topics.append(t)
+            elif t != "Welcome":
+                main_topics.append(t)
+        main_topics.sort()
+        tech_topics.sort()
+        main_topics.insert(0, "Welcome")
         all_sorted_topics = main_topics + tech_topics
         
         # Left side: Topic list
@@ -1430,6 +1801,22 @@ class HackDvbGui(tk.Tk):
         content_text.tag_configure("bullet", lmargin1=20, lmargin2=20)
         content_text.tag_configure("code", font=("Courier New", 9), background="#eeeeee", relief="raised", borderwidth=1)
 
+        def parse_topic_content(content):
+            """Splits topic content into (text, tag) segments for the text widget."""
+            segments = []
+            for line in content.split('\n'):
+                s = line.strip()
+                if s[:3] == '---' and s[-3:] == '---':
+                    segments.append((s.strip(' -') + '\n', "subtitle")) # It's a subtitle
+                elif s[:1] == '•':
+                    segments.append((line + '\n', "bullet"))
+                else:
+                    segments.append((line + '\n', ()))
+            return segments
+
+        parsed_topics = {} # Cache of topic key -> flattened (text, tag, ...) insert arguments
+        rendered_topic = [None] # Topic currently shown in the content pane
+
         def show_topic_content(event=None):
             selected_indices = topic_listbox.curselection()
             if not selected_indices:
@@ -1440,22 +1827,23 @@ class HackDvbGui(tk.Tk):
             if topic_key.startswith("---"):
                 return
 
+            # Re-selecting the topic that is already displayed needs no re-render
+            if rendered_topic[0] == topic_key:
+                return
+            rendered_topic[0] = topic_key
+
             topic_data = wiki_content.get(topic_key, {"title": "Topic Not Found", "content": ""})
  
             content_title.config(text=topic_data["title"])
             content_text.delete("1.0", tk.END)
 
             # --- Insert content with formatting ---
-            content = topic_data["content"]
-            for line in content.split('\n'):
-                stripped_line = line.strip()
-                if stripped_line.startswith('---') and stripped_line.endswith('---'):
-                    # It's a subtitle
-                    content_text.insert(tk.END, f"{stripped_line.strip(' -')}\n", "subtitle")
-                elif stripped_line.startswith('•'):
-                    content_text.insert(tk.END, f"{line}\n", "bullet")
-                else:
-                    content_text.insert(tk.END, f"{line}\n")
+            # Segments are parsed once per topic and inserted with a single Tk call.
+            insert_args = parsed_topics.get(topic_key)
+            if insert_args is None:
+                insert_args = [item for segment in parse_topic_content(topic_data["content"]) for item in segment]
+                parsed_topics[topic_key] = insert_args
+            content_text.insert(tk.END, *insert_args)
 
         def filter_topics(*args):
             search_term = search_var.get().lower()
@@ -1489,8 +1877,24 @@ class HackDvbGui(tk.Tk):
         )
         intro_label = ttk.Label(main_frame, text=intro_text, justify=tk.LEFT)
         intro_label.pack(fill='x', pady=(0, 15))
-        # Bind configure event directly to the label
-        intro_label.bind('<Configure>', lambda e: e.widget.configure(wraplength=e.width - 10))
+
+        # Labels whose text is re-wrapped to their width when the dialog is resized, as (label, margin)
+        wrap_labels = [(intro_label, 10)]
+        rewrap_pending = [False]
+
+        def rewrap_labels():
+            rewrap_pending[0] = False
+            for label, margin in wrap_labels:
+                label.configure(wraplength=max(1, label.winfo_width() - margin))
+
+        def on_dialog_configure(event):
+            # <Configure> on a Toplevel also fires for every child; only react to the dialog itself
+            # and wait for the idle pass so the labels already have their new width.
+            if event.widget is dialog and not rewrap_pending[0]:
+                rewrap_pending[0] = True
+                dialog.after_idle(rewrap_labels)
+
+        dialog.bind('<Configure>', on_dialog_configure)
 
         def create_dependency_frame(parent, title, what_it_is, why_needed, website_url=None):
             frame = ttk.Labelframe(parent, text=title, padding=10, style="Card.TLabelframe")
@@ -1500,12 +1904,11 @@ class HackDvbGui(tk.Tk):
             ttk.Label(frame, text="What it is:", font=("Segoe UI", 9, "bold")).grid(row=0, column=0, sticky='nw', padx=(0, 10))
             what_label = ttk.Label(frame, text=what_it_is, justify=tk.LEFT)
             what_label.grid(row=0, column=1, sticky='ew')
-            what_label.bind('<Configure>', lambda e: e.widget.configure(wraplength=e.width))
 
             ttk.Label(frame, text="Why it's needed:", font=("Segoe UI", 9, "bold")).grid(row=1, column=0, sticky='nw', padx=(0, 10), pady=(5,0))
             why_label = ttk.Label(frame, text=why_needed, justify=tk.LEFT)
             why_label.grid(row=1, column=1, sticky='ew', pady=(5,0))
-            why_label.bind('<Configure>', lambda e: e.widget.configure(wraplength=e.width))
+            wrap_labels.extend([(what_label, 0), (why_label, 0)])
 
             if website_url:
                 ttk.Label(frame, text="Website:", font=("Segoe UI", 9, "bold")).grid(row=2, column=0, sticky='nw', padx=(0, 10), pady=(5,0))
@@ -1547,69 +1950,127 @@ class HackDvbGui(tk.Tk):
             self.cuda_checkbox.config(state=tk.DISABLED)
             self.converter_use_cuda_var.set(False)
             self.converter_cuda_checkbox.config(state=tk.DISABLED)
+        elif not self.use_qsv_var.get():
+            self.cuda_checkbox.config(state=tk.NORMAL)
+            self.converter_cuda_checkbox.config(state=tk.NORMAL)
 
         if not self.qsv_supported:
             self.use_qsv_var.set(False)
             self.qsv_checkbox.config(state=tk.DISABLED)
             self.converter_use_qsv_var.set(False)
             self.converter_qsv_checkbox.config(state=tk.DISABLED)
+        elif not self.use_cuda_var.get():
+            self.qsv_checkbox.config(state=tk.NORMAL)
+            self.converter_qsv_checkbox.config(state=tk.NORMAL)
 
-    def check_cuda_support(self):
-        """Checks if ffmpeg has support for CUDA NVENC encoders."""
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        # Channels added before detection finished only offer the default single GPU
+        gpu_values = list(range(self.cuda_device_count))
+        gpu_state = self._gpu_combo_state()
+        for channel in self.channels:
+            channel["gpu_index_combo"].config(values=gpu_values, state=gpu_state)
+            if channel["gpu_index"].get() >= self.cuda_device_count:
+                channel["gpu_index"].set(self.cuda_device_count - 1)
+
+    def _gpu_combo_state(self):
+        """The per-service GPU selector is only useful with working CUDA and more than one GPU."""
+        return "readonly" if self.cuda_supported and self.cuda_device_count > 1 else tk.DISABLED
+
+    def _hw_support_cache_key(self):
+        """Returns a key identifying the current ffmpeg binary (path, mtime, size), or None if not found."""
+        ffmpeg_exe = shutil.which(self.ffmpeg_path.get())
+        if not ffmpeg_exe:
+            return None
+        try:
+            st = os.stat(ffmpeg_exe)
+        except OSError:
+            return None
+        return f"{os.path.abspath(ffmpeg_exe)}|{st.st_mtime_ns}|{st.st_size}"
+
+    def detect_hw_support(self):
+        """
+        Determines CUDA/QSV encoder support. The result is cached on disk next to the settings file,
+        keyed by the ffmpeg binary, so the slow probes only run when ffmpeg changes.
+        """
+        cache_key = self._hw_support_cache_key()
+        if cache_key is None:
+            return
+        cache_file = os.path.join(os.path.dirname(self.settings_file), ".hackdvb_hw_cache.json")
 
         try:
-            # Step 1: Check if the encoders are listed in the build. This is a fast check.
-            ffmpeg_exe = self.ffmpeg_path.get()
-            result = subprocess.run([ffmpeg_exe, '-encoders'], capture_output=True, text=True, startupinfo=startupinfo)
-            output = result.stdout
-            if 'h264_nvenc' not in output or 'hevc_nvenc' not in output:
-                return False # Encoders not even built, no need to go further.
-
-            # Step 2: Perform a "dry run" to see if CUDA can actually be initialized.
-            # This tests the hardware and drivers. We use a command that is very fast and will
-            # fail early if CUDA context cannot be created.
-            dry_run_cmd = [
-                ffmpeg_exe, '-f', 'lavfi', '-i', 'nullsrc', '-c:v', 'h264_nvenc',
-                '-preset', 'p1', '-f', 'null', '-'
-            ]
-            result = subprocess.run(dry_run_cmd, capture_output=True, text=True, startupinfo=startupinfo)
-            # If the command fails and the error contains CUDA-related errors, it's not supported.
-            return "Cannot load" not in result.stderr and "cuda" not in result.stderr.lower()
+            with open(cache_file, 'r') as f:
+                cached = json.load(f).get(cache_key)
+        except (json.JSONDecodeError, IOError, AttributeError):
+            cached = None
+
+        if isinstance(cached, dict): # Anything else is a hand-edited or outdated entry; probe again
+            self.cuda_supported = bool(cached.get("nvenc", False))
+            self.qsv_supported = bool(cached.get("qsv", False))
+            cuda_devices = cached.get("cuda_devices", 1)
+            self.cuda_device_count = cuda_devices if isinstance(cuda_devices, int) and cuda_devices > 0 else 1
+            self.update_hw_support_ui()
+            return
 
-        except (FileNotFoundError, Exception) as e:
-            # ffmpeg not found or another error occurred
-            return False
-        return False
+        def on_probed(cuda_supported, qsv_supported, cuda_device_count):
+            self.cuda_supported = cuda_supported
+            self.qsv_supported = qsv_supported
+            self.cuda_device_count = cuda_device_count
+            self.update_hw_support_ui()
+            # Only the current binary is kept, so a changed ffmpeg invalidates the cache.
+            try:
+                with open(cache_file, 'w') as f:
+                    json.dump({cache_key: {"nvenc": cuda_supported, "qsv": qsv_supported, "cuda_devices": self.cuda_device_count}}, f, indent=4)
+            except IOError as e:
+                print(f"Warning: Could not write hardware support cache to {cache_file}: {e}")
 
-    def check_qsv_support(self):
-        """Checks if ffmpeg has support for Intel QSV encoders."""
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        ffmpeg_exe = self.ffmpeg_path.get() # Read on the GUI thread; the probe thread must not touch Tk
+
+        def probe():
+            cuda_supported = self.check_cuda_support(ffmpeg_exe)
+            qsv_supported = self.check_qsv_support(ffmpeg_exe)
+            cuda_device_count = self._count_cuda_devices() if cuda_supported else 1
+            self.after(0, on_probed, cuda_supported, qsv_supported, cuda_device_count)
+
+        # The probes run ffmpeg several times, so keep them off the GUI thread.
+        threading.Thread(target=probe, daemon=True).start()
 
+    def _run_hw_probe(self, cmd):
+        """Runs a hardware detection command with a timeout. Returns the CompletedProcess, or None on failure."""
         try:
-            # Step 1: Check if the encoders are listed in the build.
-            ffmpeg_exe = self.ffmpeg_path.get()
-            result = subprocess.run([ffmpeg_exe, '-encoders'], capture_output=True, text=True, startupinfo=startupinfo)
-            output = result.stdout
-            if 'h264_qsv' not in output or 'hevc_qsv' not in output:
-                return False
-
-            # Step 2: Perform a "dry run" to see if QSV can be initialized.
-            dry_run_cmd = [
-                ffmpeg_exe, '-f', 'lavfi', '-i', 'nullsrc', '-c:v', 'h264_qsv',
-                '-f', 'null', '-'
-            ]
-            result = subprocess.run(dry_run_cmd, capture_output=True, text=True, startupinfo=startupinfo)
-            return "Impossible to convert between formats" not in result.stderr and "failed" not in result.stderr.lower()
+            return subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, text=True, errors='replace',
+                                  timeout=self._HW_PROBE_TIMEOUT, startupinfo=_STARTUPINFO)
+        except (OSError, subprocess.SubprocessError): # Not found, or hung and killed by the timeout
+            return None
 
-        except (FileNotFoundError, Exception):
-            return False
+    def _check_hw_encoder(self, ffmpeg_exe, encoders, dry_run_args):
+        """
+        Checks that ffmpeg lists all of encoders and can encode one frame with the first of them.
+        The dry run tests the hardware and drivers, not just the build.
+        """
+        result = self._run_hw_probe([ffmpeg_exe, '-hide_banner', '-encoders'])
+        if result is None or not all(encoder in result.stdout for encoder in encoders):
+            return False # Encoders not even built, no need to go further.
+        # nullsrc is endless, so encode a single frame; the exit status says whether it worked
+        dry_run_cmd = [
+            ffmpeg_exe, '-hide_banner', '-v', 'error', '-f', 'lavfi', '-i', 'nullsrc',
+            '-frames:v', '1', '-c:v', encoders[0], *dry_run_args, '-f', 'null', '-'
+        ]
+        result = self._run_hw_probe(dry_run_cmd)
+        return result is not None and result.returncode == 0
+
+    def check_cuda_support(self, ffmpeg_exe):
+        """Checks if ffmpeg has support for CUDA NVENC encoders."""
+        return self._check_hw_encoder(ffmpeg_exe, ('h264_nvenc', 'hevc_nvenc'), ('-preset', 'p1'))
+
+    def check_qsv_support(self, ffmpeg_exe):
+        """Checks if ffmpeg has support for Intel QSV encoders."""
+        return self._check_hw_encoder(ffmpeg_exe, ('h264_qsv', 'hevc_qsv'), ())
+
+    def _count_cuda_devices(self):
+        """Counts the available GPUs so channels can be spread across them."""
+        result = self._run_hw_probe(['nvidia-smi', '-L'])
+        if result is None:
+            return 1 # nvidia-smi not available, assume a single GPU
+        return max(1, sum(1 for line in result.stdout.splitlines() if line.startswith("GPU ")))
 
     def update_audio_options(self, *args):
         """Updates audio bitrate and sample rate options based on the selected codec."""
@@ -1621,12 +2082,12 @@ class HackDvbGui(tk.Tk):
 
         # Update bitrates
         self.audio_bitrate_combobox['values'] = options["bitrates"]
-        if self.audio_bitrate.get() not in options["bitrates"]:
+        if self.audio_bitrate.get() not in options["bitrates_set"]:
             self.audio_bitrate.set(options["default_bitrate"])
 
         # Update sample rates
         self.audio_samplerate_combobox['values'] = options["samplerates"]
-        if self.audio_samplerate.get() not in options["samplerates"]:
+        if self.audio_samplerate.get() not in options["samplerates_set"]:
             self.audio_samplerate.set(options["samplerates"][0])
 
     def update_hw_accel_options(self, *args):
@@ -1652,40 +2113,18 @@ class HackDvbGui(tk.Tk):
 
         # --- Update Preset Dropdown ---
         self.preset_combobox['values'] = self.preset_map[encoder_type]
-        if self.preset.get() not in self.preset_map[encoder_type]:
+        if self.preset.get() not in self.preset_set_map[encoder_type]:
             # Set a sensible default for the new encoder type
             default_preset = "medium" if encoder_type != "cuda" else "p4 (medium)"
             self.preset.set(default_preset)
 
         # --- Update Codec Dropdown ---
-        if encoder_type == "cuda":
-            self.video_codec_combobox['values'] = self.video_codec_map["cuda"]
-            if current_codec == "libx264":
-                self.video_codec.set("h264_nvenc")
-            elif current_codec == "libx265":
-                self.video_codec.set("hevc_nvenc")
-            elif current_codec.endswith("_qsv"):
-                self.video_codec.set("h264_nvenc")
-            elif current_codec not in self.video_codec_map["cuda"]:
-                self.video_codec.set("h264_nvenc")
-        elif encoder_type == "qsv":
-            self.video_codec_combobox['values'] = self.video_codec_map["qsv"]
-            if current_codec == "libx264":
-                self.video_codec.set("h264_qsv")
-            elif current_codec == "libx265":
-                self.video_codec.set("hevc_qsv")
-            elif current_codec.endswith("_nvenc"):
-                self.video_codec.set("h264_qsv")
-            elif current_codec not in self.video_codec_map["qsv"]:
-                self.video_codec.set("h264_qsv")
-        else:
-            self.video_codec_combobox['values'] = self.video_codec_map["software"]
-            if current_codec.endswith("_nvenc"):
-                self.video_codec.set("libx264")
-            elif current_codec.endswith("_qsv"):
-                self.video_codec.set("libx265")
-            elif current_codec not in self.video_codec_map["software"]:
-                self.video_codec.set("mpeg2video")
+        codec_list = self.video_codec_map[encoder_type]
+        self.video_codec_combobox['values'] = codec_list
+        if current_codec not in self.video_codec_set_map[encoder_type]:
+            remap = self._codec_remap[encoder_type]
+            codec_suffix = current_codec[current_codec.rfind('_'):] if '_' in current_codec else ""
+            self.video_codec.set(remap.get(current_codec) or remap.get(codec_suffix) or self._default_codec[encoder_type])
 
         self.update_command_preview()
 
@@ -1706,39 +2145,41 @@ class HackDvbGui(tk.Tk):
             self.dek_fec_var.set(fec_opts[len(fec_opts) // 2])
 
         self.update_command_preview()
-        self.calculate_mux_rate()
+        self._schedule_mux_rate()
+
+    def _schedule_mux_rate(self):
+        """Schedules calculate_mux_rate, coalescing bursts of option changes into a single calculation."""
+        if self._mux_after_id:
+            self.after_cancel(self._mux_after_id)
+        self._mux_after_id = self.after(50, self.calculate_mux_rate)
 
     def calculate_mux_rate(self):
+        self._mux_after_id = None
         try:
             symrate_str = self.dek_symrate.get()
             fec_str = self.dek_fec_var.get()
             standard = self.dvb_standard.get()
 
             if not symrate_str or not fec_str:
-                self.mux_rate_mbps_label.config(text="")
+                self._set_mux_rate_label("")
                 return
 
             symrate = int(symrate_str)
-            fec_num, fec_den = map(int, fec_str.split('/'))
-            fec = fec_num / fec_den
+            fec = self._fec_cache.get(fec_str)
+            if fec is None:
+                fec_num, fec_den = map(int, fec_str.split('/'))
+                fec = self._fec_cache[fec_str] = fec_num / fec_den
 
             mux_rate_bps = 0
 
             if standard == "DVB-S":
                 # DVB-S uses QPSK (2 bits/symbol) and Reed-Solomon (188/204)
                 bits_per_symbol = 2
-                rs_overhead = 188 / 204
-                mux_rate_bps = symrate * bits_per_symbol * fec * rs_overhead
+                mux_rate_bps = symrate * bits_per_symbol * fec * self._RS_OVERHEAD
 
             elif standard == "DVB-S2":
                 mod = self.dek_mod_var.get()
-                bits_per_symbol_map = {
-                    "DVB-S2-QPSK": 2,
-                    "DVB-S2-8PSK": 3,
-                    "DVB-S2-16APSK": 4,
-                    "DVB-S2-32APSK": 5
-                }
-                bits_per_symbol = bits_per_symbol_map.get(mod, 0)
+                bits_per_symbol = self._BITS_PER_SYMBOL.get(mod, 0)
                 
                 # DVB-S2 uses LDPC+BCH. The overhead is complex, but a common approximation
                 # for the final TS rate is to use a factor around 0.97 (representing ~3% overhead for pilots, BB header etc).
@@ -1746,14 +2187,20 @@ class HackDvbGui(tk.Tk):
                 efficiency_factor = 0.97 
                 mux_rate_bps = symrate * bits_per_symbol * fec * efficiency_factor
 
-            self.mux_rate_var.set(str(int(mux_rate_bps)))
-            self.mux_rate_mbps_label.config(text=f"~{mux_rate_bps / 1_000_000:.2f} Mbps")
+            self.mux_rate_var.set("%d" % mux_rate_bps) # %d truncates like int() did
+            self._set_mux_rate_label(f"~{mux_rate_bps * 1e-6:.2f} Mbps")
             self.update_command_preview()
 
         except (ValueError, ZeroDivisionError) as e:
-            self.mux_rate_mbps_label.config(text="Invalid input")
+            self._set_mux_rate_label("Invalid input")
         except Exception as e:
-            self.mux_rate_mbps_label.config(text="Error")
+            self._set_mux_rate_label("Error")
+
+    def _set_mux_rate_label(self, text):
+        """Updates the Mbps label, skipping the Tcl call when the text is unchanged."""
+        if text != self._last_mux_text:
+            self._last_mux_text = text
+            self.mux_rate_mbps_label.config(text=text)
 
     def add_channel(self):
         channel_num = len(self.channels) + 1
@@ -1771,8 +2218,8 @@ class HackDvbGui(tk.Tk):
         service_frame.grid_rowconfigure(2, pad=5)
         service_frame.grid_rowconfigure(3, pad=5)
         service_frame.grid_rowconfigure(4, pad=5)
-        # The lambda captures the service_frame widget itself to identify which channel to remove.
-        remove_button = ttk.Button(service_frame, text="✖", width=3, command=lambda sf=service_frame: self.remove_channel(sf))
+        # The partial captures the service_frame widget itself to identify which channel to remove.
+        remove_button = ttk.Button(service_frame, text="✖", width=3, command=partial(self.remove_channel, service_frame))
         ToolTip(remove_button, "Remove this service and its corresponding input card.")
         remove_button.grid(row=0, column=0, sticky='n', padx=(0, 10))
 
@@ -1795,6 +2242,15 @@ class HackDvbGui(tk.Tk):
         tv_radio_button.pack(side=tk.LEFT, padx=(0, 10))
         radio_radio_button.pack(side=tk.LEFT)
 
+        # --- GPU Selection (multi-GPU systems) ---
+        # Spread channels round-robin across the available CUDA devices by default.
+        gpu_index_var = tk.IntVar(value=channel_index % self.cuda_device_count)
+        ttk.Label(mode_frame, text="GPU:").pack(side=tk.LEFT, padx=(15, 5))
+        gpu_index_combo = ttk.Combobox(mode_frame, textvariable=gpu_index_var, values=list(range(self.cuda_device_count)), state=self._gpu_combo_state(), width=3)
+        gpu_index_combo.pack(side=tk.LEFT)
+        gpu_index_combo.bind("<<ComboboxSelected>>", self.update_command_preview)
+        ToolTip(gpu_index_combo, "The NVIDIA GPU used to encode this service when CUDA is enabled.\nOn systems with several GPUs, spreading services across them increases total encoding capacity.")
+
         # --- Create Input UI on the Inputs Tab ---
         # Create a container frame for this channel's inputs
         channel_input_frame = ttk.Labelframe(self.inputs_frame, text=f"Input Source: FilmNet {channel_num}", padding=10)
@@ -1807,7 +2263,7 @@ class HackDvbGui(tk.Tk):
         input_label.grid(row=0, column=0, sticky="w", pady=2)
 
         input_type_var = tk.StringVar(value="Concat File")
-        input_type_combo = ttk.Combobox(channel_input_frame, textvariable=input_type_var, values=["Concat File", "Single Media File", "Playlist", "UDP/IP Stream"], state="readonly", width=15)
+        input_type_combo = ttk.Combobox(channel_input_frame, textvariable=input_type_var, values=_INPUT_TYPES, state="readonly", width=15)
         ToolTip(input_type_combo, "Choose the type of input source for this channel.\n- Concat File: An FFmpeg-native text file listing media files to play in sequence.\n- Single Media File: A single video/audio file.\n- Playlist: A user-friendly, re-orderable list of media files.\n- UDP/IP Stream: A network stream (e.g., udp://@239.0.0.1:1234).")
         input_type_combo.grid(row=0, column=1, sticky="ew", padx=(0, 5))
 
@@ -1817,7 +2273,7 @@ class HackDvbGui(tk.Tk):
         input_path_entry.grid(row=0, column=2, sticky="ew")
         TextContextMenu(input_path_entry)
 
-        browse_button = ttk.Button(channel_input_frame, text="Browse...", command=lambda v=input_path_var: self.browse_file(v, filetypes=[("All files", "*.*")]))
+        browse_button = ttk.Button(channel_input_frame, text="Browse...", command=partial(self.browse_file, input_path_var, filetypes=[("All files", "*.*")]))
         ToolTip(browse_button, "Browse for the selected file type.")
         browse_button.grid(row=0, column=3, sticky="w", padx=(5, 0))
 
@@ -1836,23 +2292,23 @@ class HackDvbGui(tk.Tk):
         subtitle_path_entry.grid(row=1, column=1, columnspan=2, sticky="ew")
         TextContextMenu(subtitle_path_entry)
 
-        subtitle_browse_button = ttk.Button(channel_input_frame, text="Browse...", command=lambda v=subtitle_path_var: self.browse_file(v, filetypes=[("Subtitle Files", "*.srt *.ass *.vtt"), ("All files", "*.*")]))
+        subtitle_browse_button = ttk.Button(channel_input_frame, text="Browse...", command=partial(self.browse_file, subtitle_path_var, filetypes=[("Subtitle Files", "*.srt *.ass *.vtt"), ("All files", "*.*")]))
         ToolTip(subtitle_browse_button, "Browse for an external subtitle file.")
         subtitle_browse_button.grid(row=1, column=3, sticky="w", padx=(5, 0))
 
         default_sub_size = "Medium"
         subtitle_size_var = tk.StringVar(value=default_sub_size)
-        subtitle_size_combobox = ttk.Combobox(channel_input_frame, textvariable=subtitle_size_var, values=list(self.subtitle_size_map.keys()), state="readonly", width=10)
+        subtitle_size_combobox = ttk.Combobox(channel_input_frame, textvariable=subtitle_size_var, values=self._subtitle_size_values, state="readonly", width=10)
         ToolTip(subtitle_size_combobox, "Font size for burned-in subtitles.")
         subtitle_size_combobox.grid(row=1, column=4, sticky="w", padx=(5,0))
-        subtitle_size_combobox.bind("<<ComboboxSelected>>", lambda e: self.update_command_preview())
+        subtitle_size_combobox.bind("<<ComboboxSelected>>", self.update_command_preview)
         
         # --- Probe Button and Track Selection ---
         action_buttons_frame = ttk.Frame(channel_input_frame)
         action_buttons_frame.grid(row=2, column=0, columnspan=5, sticky='ew', pady=(5,0))
         action_buttons_frame.grid_columnconfigure(0, weight=1)
         action_buttons_frame.grid_columnconfigure(1, weight=1)
-        probe_button = ttk.Button(channel_input_frame, text="Probe Input Tracks", command=lambda ch_num=channel_num: self.probe_input(ch_num))
+        probe_button = ttk.Button(channel_input_frame, text="Probe Input Tracks", command=partial(self.probe_input, channel_num))
         ToolTip(probe_button, "Use ffprobe to analyze the input file and detect available audio and subtitle tracks.\nThis populates the track selection dropdowns below.")
         probe_button.grid(in_=action_buttons_frame, row=0, column=0, sticky='ew', padx=(0, 5))
 
@@ -1861,17 +2317,17 @@ class HackDvbGui(tk.Tk):
         track_label.grid(row=3, column=0, sticky="w", pady=2)
 
         # --- Audio Track Selection Button ---
-        audio_select_button = ttk.Button(channel_input_frame, text="Select Audio Tracks...", command=lambda ch_num=channel_num: self.open_audio_selection_dialog(ch_num))
+        audio_select_button = ttk.Button(channel_input_frame, text="Select Audio Tracks...", command=partial(self.open_audio_selection_dialog, channel_num))
         ToolTip(audio_select_button, "After probing, click to select which audio tracks from the source file to include in the broadcast (e.g., for multiple languages).")
         audio_select_button.grid(row=4, column=1, columnspan=2, sticky="ew")
         subtitle_track_var = tk.StringVar(value="None")
         subtitle_track_combobox = ttk.Combobox(channel_input_frame, textvariable=subtitle_track_var, values=["None"], state="readonly", width=25)
         ToolTip(subtitle_track_combobox, "After probing, select an embedded subtitle track to pass through as a DVB Subtitle stream.\nThe viewer can enable/disable these on their receiver. This uses very little CPU.")
         subtitle_track_combobox.grid(row=4, column=3, columnspan=2, sticky="ew", padx=(5,0))
-        subtitle_track_combobox.bind("<<ComboboxSelected>>", lambda e, ch_num=channel_num: self.on_track_selected(ch_num, 'subtitle'))
+        subtitle_track_combobox.bind("<<ComboboxSelected>>", partial(self.on_track_selected, channel_num, 'subtitle'))
 
         # --- Auto-generate EPG button ---
-        autogen_epg_button = ttk.Button(channel_input_frame, text="Auto-generate EPG from files", command=lambda ch_num=channel_num: self.autogen_epg_from_files(ch_num))
+        autogen_epg_button = ttk.Button(channel_input_frame, text="Auto-generate EPG from files", command=partial(self.autogen_epg_from_files, channel_num))
         ToolTip(autogen_epg_button, "Automatically create EPG events based on the files in this input source.\nIt will ask for a start time, then create a back-to-back schedule based on video durations.\nThe generated events are added to the EPG Editor.")
         autogen_epg_button.grid(in_=action_buttons_frame, row=0, column=1, sticky='ew')
 
@@ -1890,47 +2346,88 @@ class HackDvbGui(tk.Tk):
         playlist_buttons_frame = ttk.Frame(playlist_frame)
         playlist_buttons_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(5,0))
 
+        # channel_data["playlist_files"] is the authoritative list; the listbox only mirrors it.
         def add_to_playlist():
             files = filedialog.askopenfilenames(title="Select Media Files", filetypes=[("All files", "*.*")])
             if files:
-                for f in files:
-                    playlist_listbox.insert(tk.END, f)
-                channel_data["playlist_files"] = list(playlist_listbox.get(0, tk.END))
+                channel_data["playlist_files"].extend(files)
+                playlist_listbox.insert(tk.END, *files)
                 self.update_command_preview()
 
         def remove_from_playlist():
             selected_indices = playlist_listbox.curselection()
+            playlist_files = channel_data["playlist_files"]
             for i in reversed(selected_indices):
+                del playlist_files[i]
                 playlist_listbox.delete(i)
-            channel_data["playlist_files"] = list(playlist_listbox.get(0, tk.END))
             self.update_command_preview()
 
         def move_item(direction):
             selected_indices = playlist_listbox.curselection()
             if not selected_indices: return
 
+            playlist_files = channel_data["playlist_files"]
             for i in selected_indices if direction == 'up' else reversed(selected_indices):
-                if (direction == 'up' and i > 0) or (direction == 'down' and i < playlist_listbox.size() - 1):
-                    text = playlist_listbox.get(i)
-                    playlist_listbox.delete(i)
+                if (direction == 'up' and i > 0) or (direction == 'down' and i < len(playlist_files) - 1):
                     new_index = i - 1 if direction == 'up' else i + 1
-                    playlist_listbox.insert(new_index, text)
+                    playlist_files[i], playlist_files[new_index] = playlist_files[new_index], playlist_files[i]
+                    playlist_listbox.delete(i)
+                    playlist_listbox.insert(new_index, playlist_files[new_index])
                     playlist_listbox.selection_set(new_index)
 
-            channel_data["playlist_files"] = list(playlist_listbox.get(0, tk.END))
             self.update_command_preview()
 
         add_btn = ttk.Button(playlist_buttons_frame, text="Add...", command=add_to_playlist)
         add_btn.pack(side=tk.LEFT); ToolTip(add_btn, "Add one or more files to the playlist.")
         remove_btn = ttk.Button(playlist_buttons_frame, text="Remove", command=remove_from_playlist)
         remove_btn.pack(side=tk.LEFT, padx=5); ToolTip(remove_btn, "Remove selected file(s) from the playlist.")
-        move_up_btn = ttk.Button(playlist_buttons_frame, text="▲", width=3, command=lambda: move_item('up'))
+        move_up_btn = ttk.Button(playlist_buttons_frame, text="▲", width=3, command=partial(move_item, 'up'))
         move_up_btn.pack(side=tk.LEFT, padx=(10, 2)); ToolTip(move_up_btn, "Move selected item up.")
-        move_down_btn = ttk.Button(playlist_buttons_frame, text="▼", width=3, command=lambda: move_item('down'))
+        move_down_btn = ttk.Button(playlist_buttons_frame, text="▼", width=3, command=partial(move_item, 'down'))
         move_down_btn.pack(side=tk.LEFT); ToolTip(move_down_btn, "Move selected item down.")
 
 
 
+        # --- Layout per input type ---
+        # Maps each widget to its grid arguments: None hides it (grid_remove), {} restores its last placement.
+        file_layout = {
+            input_type_combo: dict(row=0, column=1, sticky="ew", padx=(0, 5)),
+            input_path_entry: {},
+            browse_button: {},
+            loop_checkbox: {},
+            subtitle_label: {},
+            subtitle_path_entry: {},
+            subtitle_browse_button: {},
+            subtitle_size_combobox: {},
+            playlist_frame: None,
+            probe_button: dict(in_=action_buttons_frame, row=0, column=0, sticky='ew', padx=(0, 5)),
+            autogen_epg_button: {},
+        }
+        input_layouts = {
+            "File": file_layout, # Concat File or Single Media File
+            "UDP/IP Stream": {
+                **file_layout,
+                browse_button: None,
+                loop_checkbox: None,
+                subtitle_label: None,
+                subtitle_path_entry: None,
+                subtitle_browse_button: None,
+                subtitle_size_combobox: None,
+                autogen_epg_button: None,
+                probe_button: dict(row=1, column=0, columnspan=5),
+            },
+            "Playlist": {
+                **file_layout,
+                input_type_combo: dict(row=0, column=0, sticky="ew", padx=0),
+                input_path_entry: None,
+                browse_button: None,
+                playlist_frame: {},
+            },
+        }
+        # The widgets above were created in the default "Concat File" layout; only the playlist needs hiding.
+        playlist_frame.grid_remove()
+        last_layout = dict(file_layout) # Layout currently applied
+
         def on_input_type_change(*args):
             # Reset fields to avoid carrying over old settings
             input_path_var.set("")
@@ -1949,45 +2446,17 @@ class HackDvbGui(tk.Tk):
             channel_data["selected_subtitle_specifier"].set("None")
             channel_data["subtitle_track_map"] = {"None": "None"}
 
-            # Adjust UI layout based on new type
-            input_type = input_type_var.get()
-            if input_type == "UDP/IP Stream":
-                input_type_combo.grid(row=0, column=1, sticky="ew", padx=(0, 5))
-                input_path_entry.grid()
-                browse_button.grid_remove()
-                loop_checkbox.grid_remove()
-                subtitle_label.grid_remove()
-                subtitle_path_entry.grid_remove()
-                playlist_frame.grid_remove()
-                subtitle_browse_button.grid_remove()
-                subtitle_size_combobox.grid_remove()
-                autogen_epg_button.grid_remove()
-                probe_button.grid_configure(row=1, column=0, columnspan=5)
-            elif input_type == "Playlist":
-                input_type_combo.grid(row=0, column=0, sticky="ew", padx=0)
-                input_path_entry.grid_remove()
-                browse_button.grid_remove()
-                input_path_entry.grid_remove()
-                playlist_frame.grid()
-                loop_checkbox.grid()
-                subtitle_label.grid()
-                subtitle_path_entry.grid()
-                subtitle_browse_button.grid()
-                subtitle_size_combobox.grid()
-                probe_button.grid(in_=action_buttons_frame, row=0, column=0, sticky='ew', padx=(0, 5))
-                autogen_epg_button.grid()
-            else:
-                input_type_combo.grid(row=0, column=1, sticky="ew", padx=(0, 5)) # Concat File or Single Media File
-                playlist_frame.grid_remove()
-                input_path_entry.grid()
-                browse_button.grid()
-                loop_checkbox.grid()
-                subtitle_label.grid()
-                subtitle_path_entry.grid()
-                subtitle_browse_button.grid()
-                subtitle_size_combobox.grid()
-                probe_button.grid(in_=action_buttons_frame, row=0, column=0, sticky='ew', padx=(0, 5))
-                autogen_epg_button.grid()
+            # Adjust UI layout based on new type, touching only the widgets whose placement changes
+            new_layout = input_layouts.get(input_type_var.get(), input_layouts["File"])
+            for widget, grid_args in new_layout.items():
+                if widget in last_layout and last_layout[widget] == grid_args:
+                    continue
+                if grid_args is None:
+                    widget.grid_remove()
+                else:
+                    widget.grid(**grid_args)
+            last_layout.clear()
+            last_layout.update(new_layout)
             self.update_command_preview()
 
         input_type_var.trace_add("write", on_input_type_change)
@@ -2010,8 +2479,6 @@ class HackDvbGui(tk.Tk):
             self.update_command_preview()
 
         s_type_var.trace_add("write", on_service_type_change)
-        # Add a trace to update the labels when the service name changes
-        s_name.trace_add("write", lambda *args, ch_num=channel_num, sn=s_name: self._update_channel_labels(ch_num, sn))
 
         channel_data = {
             "num": channel_num,
@@ -2020,6 +2487,8 @@ class HackDvbGui(tk.Tk):
             "provider": s_provider,
             "pid": s_pid,
             "service_type": s_type_var,
+            "gpu_index": gpu_index_var,
+            "gpu_index_combo": gpu_index_combo,
             "input_type": input_type_var,
             "input_path": input_path_var,
             "loop": loop_var,
@@ -2034,22 +2503,38 @@ class HackDvbGui(tk.Tk):
             "audio_track_map": {"Default Audio": ("a:0", "und")}, # Maps display name to (specifier, lang_code)
             "subtitle_track_map": {"None": "None"},
             # Store all widgets in a list for easy removal
-            "input_widgets": [channel_input_frame]
+            "input_widgets": [channel_input_frame],
+            "_grid_pos": (row, col) # Current (row, column) of the service and input cards
         }
         channel_data['playlist_files'] = [] # Add a list to store playlist file paths
+        # Add a trace to update the labels when the service name changes. The channel number is read
+        # from the channel dict at call time, so the trace stays valid when channels are renumbered.
+        channel_data["_name_trace"] = s_name.trace_add("write", lambda *args, cd=channel_data: self._update_channel_labels(cd["num"], cd["name"]))
+        channel_data["_pid_map_traces"] = (
+            s_name.trace_add("write", self._invalidate_pid_to_channel_name),
+            s_pid.trace_add("write", self._invalidate_pid_to_channel_name),
+        )
+        self._channel_by_frame[id(service_frame)] = len(self.channels)
         self.channels.append(channel_data)
-        # Run once to set initial state
-        on_input_type_change()
-        on_service_type_change()
+        self._pid_to_channel_name = None
+        # The widgets already reflect the default "Concat File" input and "TV" service type,
+        # so the change handlers only run when the user (or a loaded project) changes them.
         self.update_command_preview()
 
+    def _invalidate_pid_to_channel_name(self, *args):
+        self._pid_to_channel_name = None
+
+    def _get_pid_to_channel_name(self):
+        """Returns a service ID -> channel name map, rebuilt only after a channel changes."""
+        pid_to_channel_name = self._pid_to_channel_name
+        if pid_to_channel_name is None:
+            pid_to_channel_name = {ch['pid'].get(): ch['name'].get() for ch in self.channels}
+            self._pid_to_channel_name = pid_to_channel_name
+        return pid_to_channel_name
+
     def remove_channel(self, service_frame_to_remove):
-        # Find the index of the channel to remove by matching its service_frame widget
-        index_to_remove = -1
-        for i, channel in enumerate(self.channels):
-            if channel["service_frame"] == service_frame_to_remove:
-                index_to_remove = i
-                break
+        # Find the index of the channel to remove by its service_frame widget
+        index_to_remove = self._channel_by_frame.pop(id(service_frame_to_remove), -1)
 
         if index_to_remove == -1:
             print("Error: Could not find channel to remove.")
@@ -2057,6 +2542,11 @@ class HackDvbGui(tk.Tk):
 
         # Remove UI elements
         channel_to_remove = self.channels[index_to_remove]
+        channel_to_remove["name"].trace_remove("write", channel_to_remove["_name_trace"])
+        name_map_trace, pid_map_trace = channel_to_remove["_pid_map_traces"]
+        channel_to_remove["name"].trace_remove("write", name_map_trace)
+        channel_to_remove["pid"].trace_remove("write", pid_map_trace)
+        self._pid_to_channel_name = None
         channel_to_remove["service_frame"].destroy()
         for widget in channel_to_remove["input_widgets"]:
             widget.destroy()
@@ -2064,27 +2554,27 @@ class HackDvbGui(tk.Tk):
         # Remove from data structure
         del self.channels[index_to_remove]
 
-        # Re-grid and re-number all remaining channels
-        for i, channel in enumerate(self.channels):
+        # Re-index, re-grid and re-number the channels that followed the removed one.
+        # Channels before it keep their number and position, so they are left untouched.
+        for i in range(index_to_remove, len(self.channels)):
+            channel = self.channels[i]
+            self._channel_by_frame[id(channel["service_frame"])] = i
             new_num = i+1
             channel["num"] = new_num
-            
+
             # Re-calculate grid position for the service card
-            row = i // 3
-            col = i % 3
-            channel["service_frame"].grid(row=row, column=col, sticky="nsew", padx=(0, 15), pady=(0, 15))
-            # Update labels using the current name
-            channel["service_frame"].config(text=f"Service {new_num}: {channel['name'].get()}")
-            
-            # Re-grid the input card and update its label
-            channel["input_widgets"][0].grid(row=row, column=col, sticky="nsew", padx=(0, 15), pady=(0, 15))
-            channel["input_widgets"][0].config(text=f"Input Source: {channel['name'].get()}")
+            grid_pos = (i // 3, i % 3)
+            if channel["_grid_pos"] != grid_pos:
+                row, col = grid_pos
+                channel["service_frame"].grid(row=row, column=col, sticky="nsew", padx=(0, 15), pady=(0, 15))
+                # Re-grid the input card
+                channel["input_widgets"][0].grid(row=row, column=col, sticky="nsew", padx=(0, 15), pady=(0, 15))
+                channel["_grid_pos"] = grid_pos
 
-            # Re-create the trace with the correct new channel number
-            s_name_var = channel['name']
-            # Remove old traces to avoid multiple calls
-            s_name_var.trace_remove("write", s_name_var.trace_info()[0][1])
-            s_name_var.trace_add("write", lambda *args, ch_num=new_num, sn=s_name_var: self._update_channel_labels(ch_num, sn))
+            # Update labels using the current name
+            name = channel['name'].get()
+            channel["service_frame"].config(text=f"Service {new_num}: {name}")
+            channel["input_widgets"][0].config(text=f"Input Source: {name}")
 
         self.update_command_preview()
 
@@ -2097,7 +2587,7 @@ class HackDvbGui(tk.Tk):
         channel = self.channels[channel_index]
         input_path = channel["input_path"].get()
         input_type = channel["input_type"].get()
-        playlist_files = channel.get("playlist_files", [])
+        playlist_files = channel.get("playlist_files", ())
 
         if input_type == "Playlist":
             if not playlist_files:
@@ -2109,65 +2599,103 @@ class HackDvbGui(tk.Tk):
             messagebox.showwarning("Probe Warning", f"Please specify an input path for Service {channel_num} first.")
             return
 
+        self.status_label.config(text=f"Status: Probing Service {channel_num}...")
+        # Run ffprobe on a worker thread to avoid freezing the GUI (this also covers reading concat lists)
+        self._probe_pool.submit(self._run_ffprobe, channel_num, input_type, input_path)
+
+    def _run_ffprobe(self, channel_num, input_type, file_path):
+        """Worker function to execute ffprobe and schedule UI update."""
         # For concat files, we probe the first file in the list.
         if input_type == "Concat File":
             try:
-                with open(input_path, 'r') as f:
-                    first_line = f.readline().strip()
-                    # The format is "file '/path/to/media.mkv'"
-                    match = re.search(r"file\s+'(.+?)'", first_line)
-                    if match:
-                        input_path = match.group(1)
-                        self.log_message(f"Probing first file in concat list: {input_path}\n")
-                    else:
-                        messagebox.showerror("Probe Error", "Could not parse the first file from the concat list. Ensure it's in the format: file '/path/to/file.ext'")
-                        return
+                with open(file_path, 'r') as f:
+                    first_line = f.readline(1024).strip() # The first entry is short; don't stall on a huge line
             except Exception as e:
-                messagebox.showerror("Probe Error", f"Could not read concat file: {e}")
+                # Format now: e is unbound when the except block ends, before the callback runs
+                self.after(0, messagebox.showerror, "Probe Error", f"Could not read concat file: {e}")
+                self.after(0, self.status_label.config, {"text": "Status: Idle"})
                 return
-
-        self.status_label.config(text=f"Status: Probing Service {channel_num}...")
-        # Run ffprobe in a separate thread to avoid freezing the GUI
-        thread = threading.Thread(target=self._run_ffprobe, args=(channel_num, input_path), daemon=True)
-        thread.start()
-
-    def _run_ffprobe(self, channel_num, file_path):
-        """Worker function to execute ffprobe and schedule UI update."""
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        ffmpeg_exe = self.ffmpeg_path.get()
-        ffprobe_exe = "ffprobe"
-        if os.path.isabs(ffmpeg_exe):
-            dir_name = os.path.dirname(ffmpeg_exe)
-            ffprobe_exe = os.path.join(dir_name, "ffprobe.exe" if os.name == 'nt' else "ffprobe")
-
-        command = [
-            ffprobe_exe,
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_streams",
-            file_path
-        ]
+            match = _CONCAT_LINE_RE.search(first_line)
+            if not match:
+                self.after(0, lambda: messagebox.showerror("Probe Error", "Could not parse the first file from the concat list. Ensure it's in the format: file '/path/to/file.ext'"))
+                self.after(0, self.status_label.config, {"text": "Status: Idle"})
+                return
+            file_path = match.group(1)
+            self.log_queue.put(f"Probing first file in concat list: {file_path}\n")
 
         try:
-            result = subprocess.run(command, capture_output=True, text=True, check=True, startupinfo=startupinfo)
-            streams_data = json.loads(result.stdout)
+            streams_data = self._probe(file_path)
             self.after(0, self._update_channel_tracks, channel_num, streams_data)
         except FileNotFoundError:
             self.log_queue.put("ERROR: ffprobe command not found. Make sure it is in your system's PATH.\n")
-            messagebox.showerror("Error", "ffprobe not found. Make sure it is installed and in your system's PATH.")
+            self.after(0, lambda: messagebox.showerror("Error", "ffprobe not found. Make sure it is installed and in your system's PATH."))
         except subprocess.CalledProcessError as e:
-            self.log_queue.put(f"ERROR: ffprobe failed for '{file_path}': {e.stderr}\n")
-            messagebox.showerror("Probe Error", f"ffprobe failed. Check the log for details.")
-        except json.JSONDecodeError:
+            self.log_queue.put(f"ERROR: ffprobe failed for '{file_path}': {e.stderr.decode('utf-8', errors='replace')}\n")
+            self.after(0, lambda: messagebox.showerror("Probe Error", "ffprobe failed. Check the log for details."))
+        except subprocess.TimeoutExpired:
+            self.log_queue.put(f"ERROR: ffprobe timed out after {self._PROBE_TIMEOUT}s for '{file_path}'.\n")
+            self.after(0, lambda: messagebox.showerror("Probe Error", "ffprobe timed out. Check that the input is reachable and sending data."))
+        except ValueError: # json.JSONDecodeError and orjson.JSONDecodeError
             self.log_queue.put(f"ERROR: Failed to parse ffprobe output for '{file_path}'.\n")
-            messagebox.showerror("Probe Error", "Failed to parse ffprobe output.")
+            self.after(0, lambda: messagebox.showerror("Probe Error", "Failed to parse ffprobe output."))
         finally:
             self.after(0, self.status_label.config, {"text": "Status: Idle"})
 
+    def _resolve_ffprobe(self):
+        """Returns the ffprobe executable, taken from the same folder as a manually set ffmpeg."""
+        ffprobe_exe = self._ffprobe_exe
+        if ffprobe_exe is None:
+            ffmpeg_exe = self.ffmpeg_path.get()
+            if os.path.isabs(ffmpeg_exe):
+                ffprobe_exe = os.path.join(os.path.dirname(ffmpeg_exe), "ffprobe.exe" if os.name == 'nt' else "ffprobe")
+            else:
+                ffprobe_exe = "ffprobe"
+            self._ffprobe_exe = ffprobe_exe
+        return ffprobe_exe
+
+    def _invalidate_ffprobe_cache(self, *args):
+        self._ffprobe_exe = None
+        # A different ffprobe build may report streams differently, so re-probe everything
+        with self._probe_cache_lock:
+            self._probe_cache.clear()
+
+    def _probe(self, file_path):
+        """
+        Runs ffprobe once for a file's duration and streams and returns the parsed JSON.
+        Only the fields this app reads are requested, which keeps ffprobe's output small.
+        Results are cached per file version, so repeated probes of an unchanged file are free.
+        Raises FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired
+        or ValueError on failure.
+        """
+        try:
+            st = os.stat(file_path)
+            cache_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        except (OSError, ValueError):
+            cache_key = None # Not a local file (e.g. a UDP stream URL)
+        if cache_key is not None:
+            with self._probe_cache_lock:
+                cached = self._probe_cache.get(cache_key)
+                if cached is not None:
+                    self._probe_cache.move_to_end(cache_key)
+                    return cached
+
+        command = [
+            self._resolve_ffprobe(),
+            "-v", "error",
+            "-print_format", "json",
+            "-show_entries", "format=duration:stream=index,codec_type,codec_name:stream_tags=language,title",
+            file_path
+        ]
+        result = subprocess.run(command, stdin=subprocess.DEVNULL, capture_output=True, check=True, close_fds=True,
+                                timeout=self._PROBE_TIMEOUT, startupinfo=_STARTUPINFO)
+        probe_data = _json_loads(result.stdout)
+        if cache_key is not None:
+            with self._probe_cache_lock:
+                self._probe_cache[cache_key] = probe_data
+                if len(self._probe_cache) > self._probe_cache_size:
+                    self._probe_cache.popitem(last=False) # Drop the least recently used entry
+        return probe_data
+
     def _update_channel_labels(self, channel_num, service_name_var):
         """Updates the labels for service and input frames when a service name changes."""
         channel_index = channel_num - 1
@@ -2183,39 +2711,25 @@ class HackDvbGui(tk.Tk):
         """Updates the UI with the probed track information. Must be called on the main thread."""
         channel = self.channels[channel_num - 1]
 
-        audio_track_map = {"Default Audio": ("a:0", "und")} # Keep a default: (specifier, lang_code)
-        subtitle_track_map = {"None": "None"} # Option to disable subtitles
+        streams = streams_data.get("streams", [])
+        audio_streams = [s for s in streams if s.get("codec_type") == "audio"]
+        subtitle_streams = [s for s in streams if s.get("codec_type") == "subtitle"]
 
-        audio_count = 0
-        subtitle_count = 0
+        def track_label(kind, i, stream):
+            tags = stream.get("tags") or _EMPTY_TAGS
+            label = f"{kind} {i}: {stream.get('codec_name', 'unknown')}, {tags.get('language', 'und')}"
+            title = tags.get("title", "")
+            return f"{label} ({title})" if title else label
 
-        for stream in streams_data.get("streams", []):
-            stream_index = stream.get("index")
-            codec_type = stream.get("codec_type")
-            
-            if codec_type == "audio":
-                # Use the count of audio streams found so far to create the specifier (a:0, a:1, etc.)
-                specifier = f"a:{audio_count}"
-                lang = stream.get("tags", {}).get("language", "und")
-                codec = stream.get("codec_name", "unknown")
-                title = stream.get("tags", {}).get("title", "")
-                label = f"Audio {audio_count}: {codec}, {lang}"
-                if title:
-                    label += f" ({title})"
-                audio_track_map[label] = (specifier, lang)
-                audio_count += 1
-
-            elif codec_type == "subtitle":
-                # Use the count of subtitle streams found so far for the specifier (s:0, s:1, etc.)
-                specifier = f"s:{subtitle_count}"
-                lang = stream.get("tags", {}).get("language", "und")
-                codec = stream.get("codec_name", "unknown")
-                title = stream.get("tags", {}).get("title", "")
-                label = f"Subtitle {subtitle_count}: {codec}, {lang}"
-                if title:
-                    label += f" ({title})"
-                subtitle_track_map[label] = specifier
-                subtitle_count += 1
+        # The position among streams of the same type gives the specifier (a:0, a:1, s:0, etc.)
+        audio_track_map = {
+            "Default Audio": ("a:0", "und"), # Keep a default: (specifier, lang_code)
+            **{track_label("Audio", i, s): (f"a:{i}", (s.get("tags") or _EMPTY_TAGS).get("language", "und")) for i, s in enumerate(audio_streams)}
+        }
+        subtitle_track_map = {
+            "None": "None", # Option to disable subtitles
+            **{track_label("Subtitle", i, s): f"s:{i}" for i, s in enumerate(subtitle_streams)}
+        }
 
         # Store the maps on the channel object
         channel["audio_track_map"] = audio_track_map
@@ -2228,7 +2742,7 @@ class HackDvbGui(tk.Tk):
         messagebox.showinfo("Probe Complete", f"Found {len(audio_track_map)-1} audio track(s) and {len(subtitle_track_map)-1} subtitle track(s).")
         self.log_message(f"Probe for Service {channel_num} complete.\n")
 
-    def on_track_selected(self, channel_num, track_type):
+    def on_track_selected(self, channel_num, track_type, event=None):
         """Called when a user selects a track from a combobox."""
         if track_type == 'audio':
             # This is now handled by the dialog's OK button
@@ -2287,23 +2801,26 @@ class HackDvbGui(tk.Tk):
         }
 
         # Gather channel data
-        for channel in self.channels:
-            config_data["channels"].append({
+        config_data["channels"] = [
+            {
                 "name": channel["name"].get(),
                 "provider": channel["provider"].get(),
                 "pid": channel["pid"].get(),
                 "service_type": channel["service_type"].get(),
+                "gpu_index": channel["gpu_index"].get(),
                 "input_type": channel["input_type"].get(),
                 "input_path": channel["input_path"].get(),
                 "loop": channel["loop"].get(),
                 "subtitle_path": channel["subtitle_path"].get(),
                 "subtitle_size": channel["subtitle_size"].get(),
-                "playlist_files": channel.get("playlist_files", []),
+                "playlist_files": channel.get("playlist_files", ()),
                 "selected_audio_specifiers": channel["selected_audio_specifiers"],
                 "selected_subtitle_specifier": channel["selected_subtitle_specifier"].get(),
                 "audio_track_map": channel["audio_track_map"],
                 "subtitle_track_map": channel["subtitle_track_map"],
-            })
+            }
+            for channel in self.channels
+        ]
 
         # Gather encoding data
         config_data["encoding"] = {
@@ -2316,6 +2833,7 @@ class HackDvbGui(tk.Tk):
             "use_qsv": self.use_qsv_var.get(),
             "video_codec": self.video_codec.get(),
             "preset": self.preset.get(),
+            "threads": self.encoder_threads.get(),
             "pixel_format": self.pix_fmt.get(),
             "aspect_ratio": self.aspect_ratio.get(),
             "video_format": self.video_format_display.get(),
@@ -2358,8 +2876,8 @@ class HackDvbGui(tk.Tk):
             return
 
         try:
-            with open(filepath, 'w') as f:
-                json.dump(config_data, f, indent=4)
+            with open(filepath, 'wb') as f:
+                f.write(_json_dumps_pretty(config_data))
             messagebox.showinfo("Success", "Configuration saved successfully.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save configuration: {e}")
@@ -2374,8 +2892,8 @@ class HackDvbGui(tk.Tk):
             return
 
         try:
-            with open(filepath, 'r') as f:
-                config_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                config_data = _json_loads(f.read())
 
             # Clear existing channels before loading new ones
             while self.channels:
@@ -2387,6 +2905,26 @@ class HackDvbGui(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load configuration: {e}")
 
+    def _recompute_bitrate_strings(self, *args):
+        """Formats the video bitrate arguments once per bitrate change instead of on every command build."""
+        video_bitrate_k = self.video_bitrate.get()
+        try:
+            video_bitrate_val = int(video_bitrate_k)
+        except (ValueError, TypeError):
+            video_bitrate_val = 0 # Fallback
+        self._video_bitrate_str = f"{video_bitrate_k}k" # Used for both -b:v and -maxrate
+        self._video_bufsize_str = f"{video_bitrate_val * 2}k"
+
+    def _escaped_subtitle_path(self, channel, subtitle_path):
+        """Returns (filter-escaped path, is_srt) for a subtitle file, cached on the channel until the path changes."""
+        cached = channel.get("_subtitle_filter_path")
+        if cached is None or cached[0] != subtitle_path:
+            # For SRT files, we need to explicitly enable force_style in the filter itself.
+            cached = channel["_subtitle_filter_path"] = (
+                subtitle_path, subtitle_path.translate(_SUB_COLON_TABLE), subtitle_path.lower().endswith('.srt')
+            )
+        return cached[1], cached[2]
+
     def get_command(self):
         eit_xml = self.eit_path.get()
 
@@ -2400,6 +2938,11 @@ class HackDvbGui(tk.Tk):
         total_audio_streams_mapped = 0
         subtitle_copy_stream_count = 0
         output_stream_counter = 0
+        video_stream_count = 0
+        gpu_args = []
+        used_gpus = []
+        video_codec = self.video_codec.get()
+        use_nvenc = 'nvenc' in video_codec
         input_idx = 0
         for i, channel in enumerate(self.channels):
             input_type = channel["input_type"].get()
@@ -2410,36 +2953,51 @@ class HackDvbGui(tk.Tk):
             subtitle_size = channel["subtitle_size"].get()
             selected_audio_specifiers = channel["selected_audio_specifiers"]
             selected_subtitle_specifier = channel["selected_subtitle_specifier"].get()
-            playlist_files = channel.get("playlist_files", [])
+            playlist_files = channel.get("playlist_files", ())
+            ch_name = channel["name"].get()
+            ch_pid = channel["pid"].get()
+            ch_provider = channel["provider"].get()
             
             # --- Add Media Input ---
             # Correctly handle looping and input types
             if input_type == "Concat File":
                 if loop:
-                    ffmpeg_cmd.extend(["-stream_loop", "-1"])
-                ffmpeg_cmd.extend(["-f", "concat", "-safe", "0", "-i", input_path])
+                    ffmpeg_cmd.extend(_LOOP_ARGS)
+                ffmpeg_cmd.extend(_CONCAT_INPUT_ARGS)
+                ffmpeg_cmd.append(input_path)
             elif input_type == "Playlist":
                 if not playlist_files:
                     # Skip this channel if the playlist is empty
                     input_idx += 1 # Still need to increment to keep indices correct
                     continue
 
-                # Create a temporary concat file for the playlist
-                temp_concat_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt', encoding='utf-8')
-                for file_path in playlist_files:
-                    # FFmpeg concat format requires forward slashes and escaped single quotes
-                    safe_path = file_path.replace('\\', '/').replace("'", "'\\''")
-                    temp_concat_file.write(f"file '{safe_path}'\n")
-                temp_concat_file.close()
-                channel["temp_concat_path"] = temp_concat_file.name # Store for cleanup
+                # Create a temporary concat file for the playlist, reusing the previous one
+                # if the playlist hasn't changed since (previews rebuild the command often)
+                playlist_sig = tuple(playlist_files)
+                temp_concat_path = channel.get("temp_concat_path")
+                if channel.get("_playlist_sig") != playlist_sig or not (temp_concat_path and os.path.exists(temp_concat_path)):
+                    if temp_concat_path:
+                        remove_file_quietly(temp_concat_path)
+                        self._temp_concat_paths.discard(temp_concat_path)
+                    temp_concat_file = tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt')
+                    concat_text = "".join([
+                        "file '" + file_path.translate(_CONCAT_PATH_TABLE) + "'\n"
+                        for file_path in playlist_files
+                    ])
+                    temp_concat_file.write(concat_text.encode('utf-8'))
+                    temp_concat_file.close()
+                    temp_concat_path = channel["temp_concat_path"] = temp_concat_file.name # Store for cleanup
+                    channel["_playlist_sig"] = playlist_sig
+                    self._temp_concat_paths.add(temp_concat_path) # In case the app exits without stopping
 
                 if loop:
-                    ffmpeg_cmd.extend(["-stream_loop", "-1"])
-                ffmpeg_cmd.extend(["-f", "concat", "-safe", "0", "-i", temp_concat_file.name])
+                    ffmpeg_cmd.extend(_LOOP_ARGS)
+                ffmpeg_cmd.extend(_CONCAT_INPUT_ARGS)
+                ffmpeg_cmd.append(temp_concat_path)
             
             elif input_type == "Single Media File":
                 if loop:
-                    ffmpeg_cmd.extend(["-stream_loop", "-1"])
+                    ffmpeg_cmd.extend(_LOOP_ARGS)
                 ffmpeg_cmd.extend(["-i", input_path])
 
             elif input_type == "UDP/IP Stream":
@@ -2452,21 +3010,29 @@ class HackDvbGui(tk.Tk):
             if service_type == "TV":
                 # Priority 1: Burn-in external subtitle file
                 if subtitle_path and input_type != "UDP/IP Stream":
-                    # For SRT files, we need to explicitly enable force_style in the filter itself.
-                    is_srt = subtitle_path.lower().endswith('.srt')
+                    escaped_subtitle_path, is_srt = self._escaped_subtitle_path(channel, subtitle_path)
 
                     numeric_size = self.subtitle_size_map.get(subtitle_size, "24") # Default to 24 if not found
                     style_overrides = [f"FontSize={numeric_size}"]
                     if is_srt:
                         style_overrides.append("ForceStyle=1")
 
-                    filter_options = f"filename='{subtitle_path.replace(':', '\\:')}':force_style='{','.join(style_overrides)}'"
+                    filter_options = f"filename='{escaped_subtitle_path}':force_style='{','.join(style_overrides)}'"
                     filter_complex_parts.append(f"[{media_input_idx}:v]subtitles={filter_options}[v_out_{i}]")
                     output_map_args.extend([f"-map", f"[v_out_{i}]"])
                 else:
                     # If no external subtitle, map the video stream directly.
                     output_map_args.extend([f"-map", f"{media_input_idx}:v:0"])
 
+                # Assign this channel's video encoder to its selected GPU.
+                if use_nvenc:
+                    # A project saved on a machine with more GPUs may name one that doesn't exist here
+                    gpu_index = min(channel["gpu_index"].get(), self.cuda_device_count - 1)
+                    if gpu_index not in used_gpus:
+                        used_gpus.append(gpu_index)
+                    gpu_args.extend([f"-gpu:v:{video_stream_count}", str(gpu_index)])
+                video_stream_count += 1
+
             # --- Map Audio and Internal Subtitles (for all channels) ---
             # 1. Map all selected audio streams.
             for specifier in selected_audio_specifiers:
@@ -2506,28 +3072,32 @@ class HackDvbGui(tk.Tk):
             program_streams = ":".join(program_streams_list)
 
             # Add per-stream language metadata for each selected audio track FOR THIS CHANNEL
-            spec_to_lang_map = {spec: lang for name, (spec, lang) in channel["audio_track_map"].items()}
-            
-            for j, specifier in enumerate(selected_audio_specifiers):
-                lang_code = "und"
-                if specifier == "a:0": # Handle "Default Audio"
-                    # Find the first audio stream in the map (excluding the "Default Audio" entry itself)
-                    first_audio_entry = next((item for key, item in channel["audio_track_map"].items() if key != "Default Audio"), None)
-                    if first_audio_entry:
-                        lang_code = first_audio_entry[1] # Get the language code
-                else:
-                    lang_code = spec_to_lang_map.get(specifier, "und")
-                
+            audio_track_map = channel["audio_track_map"]
+            spec_to_lang_map = {spec: lang for name, (spec, lang) in audio_track_map.items()}
+            # "Default Audio" (a:0) takes the language of the first probed audio stream
+            spec_to_lang_map["a:0"] = next((lang for key, (spec, lang) in audio_track_map.items() if key != "Default Audio"), "und")
+
+            for specifier in selected_audio_specifiers:
+                lang_code = spec_to_lang_map.get(specifier, "und")
                 metadata_args.extend([f"-metadata:s:a:{total_audio_streams_mapped}", f"language={lang_code}"])
                 total_audio_streams_mapped += 1
             
             # Add program and essential service metadata (for SDT)
-            program_args.extend(["-program", f"title={channel['name'].get()}:program_num={channel['pid'].get()}:{program_streams}"])
-            metadata_args.extend([f"-metadata:s:p:{i}", f"service_name={channel['name'].get()}"])
-            metadata_args.extend([f"-metadata:s:p:{i}", f"service_provider={channel['provider'].get()}"])
+            program_args.extend(["-program", f"title={ch_name}:program_num={ch_pid}:{program_streams}"])
+            metadata_args.extend([f"-metadata:s:p:{i}", f"service_name={ch_name}"])
+            metadata_args.extend([f"-metadata:s:p:{i}", f"service_provider={ch_provider}"])
 
 
         # --- Build Final Command ---
+        # Initialise one CUDA device per GPU in use. The inputs are already added, so
+        # insert the device options right after "-y" where they apply globally.
+        if used_gpus:
+            hw_device_args = []
+            for gpu_index in used_gpus:
+                hw_device_args.extend(["-init_hw_device", f"cuda=cu{gpu_index}:{gpu_index}"])
+            hw_device_args.extend(["-filter_hw_device", f"cu{used_gpus[0]}"])
+            ffmpeg_cmd[2:2] = hw_device_args
+
         if filter_complex_parts:
             ffmpeg_cmd.extend(["-filter_complex", ";".join(filter_complex_parts)])
 
@@ -2537,31 +3107,25 @@ class HackDvbGui(tk.Tk):
         resolution, scan_type, frame_rate = self.video_format_map[self.video_format_display.get()]
 
         # Apply common encoding settings that apply to all streams of a given type
-        video_codec = self.video_codec.get()
-        video_bitrate_k = self.video_bitrate.get()
-        try:
-            video_bitrate_val = int(video_bitrate_k)
-        except (ValueError, TypeError):
-            video_bitrate_val = 0 # Fallback
-
         common_video_opts = [
             "-pix_fmt", self.pix_fmt.get(), "-r", frame_rate, "-s", resolution, "-aspect", self.aspect_ratio.get(),
-            "-maxrate", f"{video_bitrate_k}k", "-bufsize", f"{video_bitrate_val * 2}k"
+            "-maxrate", self._video_bitrate_str, "-bufsize", self._video_bufsize_str
         ]
         if scan_type != "prog":
             common_video_opts.extend(["-field_order", scan_type])
 
         preset_val = self.preset.get().split(" ")[0] # Gets "p4" from "p4 (medium)"
+        use_bframes = self.use_bframes_var.get()
 
         # Add encoder-specific options
-        if 'nvenc' in video_codec:
+        if use_nvenc:
             # Options for NVIDIA NVENC hardware encoders
             common_video_opts.extend(["-preset", preset_val, "-tune", "hq", "-rc", "vbr", "-g", "12"])
         elif 'qsv' in video_codec:
             # Options for Intel QSV hardware encoders
             # QSV has different preset names and options. 'veryfast' is a good balance.
             common_video_opts.extend(["-preset", preset_val, "-tune", "hq", "-rc", "vbr", "-g", "12"])
-            if self.use_bframes_var.get():
+            if use_bframes:
                 common_video_opts.extend(["-bf", "3"])
             else:
                 common_video_opts.extend(["-bf", "0"])
@@ -2570,6 +3134,16 @@ class HackDvbGui(tk.Tk):
             common_video_opts.extend([
                 "-preset", preset_val, "-g", "50" # Use a longer GOP for better efficiency
             ])
+            if video_codec in ("libx264", "libx265"):
+                threads = self.encoder_threads.get()
+                if not threads.isdigit():
+                    threads = str(os.cpu_count() or 1) # "Auto"
+                common_video_opts.extend(["-threads", threads])
+                if video_codec == "libx264":
+                    # Sliced threads keep encoding latency low for real-time broadcast
+                    common_video_opts.extend(["-x264-params", f"sliced-threads=1:threads={threads}"])
+                else:
+                    common_video_opts.extend(["-x265-params", f"pools={threads}:frame-threads={min(4, int(threads))}:wpp=1"])
 
         common_audio_opts = ["-ar", self.audio_samplerate.get(), "-ac", "2"]
         # Add loudnorm filter only if the checkbox is ticked
@@ -2577,13 +3151,14 @@ class HackDvbGui(tk.Tk):
             common_audio_opts.extend(["-af", "loudnorm=I=-23:TP=-2:LRA=11"])
         
         # Apply codecs and options to all mapped streams
-        if 'nvenc' not in video_codec: # B-frames for software encoders
-            if self.use_bframes_var.get():
+        if not use_nvenc: # B-frames for software encoders
+            if use_bframes:
                 ffmpeg_cmd.extend(["-bf", "3"])
             else:
                 ffmpeg_cmd.extend(["-bf", "0"])
-        ffmpeg_cmd.extend([f"-c:v", self.video_codec.get(), f"-b:v", f"{video_bitrate_k}k"])
+        ffmpeg_cmd.extend([f"-c:v", video_codec, f"-b:v", self._video_bitrate_str])
         ffmpeg_cmd.extend(common_video_opts)
+        ffmpeg_cmd.extend(gpu_args)
         
         ffmpeg_cmd.extend([f"-c:a", self.audio_codec.get(), f"-b:a", f"{self.audio_bitrate.get()}k"])
         ffmpeg_cmd.extend(common_audio_opts)
@@ -2594,10 +3169,26 @@ class HackDvbGui(tk.Tk):
 
         ffmpeg_cmd.extend(["-muxrate", self.mux_rate_var.get(), "-f", "mpegts", "pipe:1"])
 
+        # The tsp command only depends on the DVB/path settings, which rarely change between previews
+        tsp_key = (
+            self.tsp_path.get(), self.mux_rate_var.get(), self.tdt_ip.get(), self.tdt_port.get(),
+            self.analysis_file_path.get(), eit_xml, self.dek_freq.get(), self.lnb_lo_freq.get(),
+            self.dek_device.get(), self.dek_mod_var.get(), self.dek_fec_var.get(), self.dek_symrate.get(),
+        )
+        if tsp_key != self._tsp_cmd_key:
+            self._tsp_cmd_cached = self._build_tsp_cmd(*tsp_key)
+            self._tsp_cmd_key = tsp_key
+        tsp_cmd = list(self._tsp_cmd_cached) # Callers get their own copy
+
+        return ffmpeg_cmd, tsp_cmd
+
+    def _build_tsp_cmd(self, tsp_path, mux_rate, tdt_ip, tdt_port, analysis_file, eit_xml,
+                       dek_freq, lnb_lo_freq, dek_device, dek_mod, dek_fec, dek_symrate):
+        """Builds the tsp command line from the DVB and path settings."""
         # Calculate output frequency in Hz
         try:
-            satellite_freq_mhz = int(self.dek_freq.get())
-            lnb_lo_mhz = int(self.lnb_lo_freq.get())
+            satellite_freq_mhz = int(dek_freq)
+            lnb_lo_mhz = int(lnb_lo_freq)
             output_freq_mhz = abs(satellite_freq_mhz - lnb_lo_mhz)
             output_freq_hz = str(output_freq_mhz * 1_000_000)
         except (ValueError, TypeError):
@@ -2607,17 +3198,17 @@ class HackDvbGui(tk.Tk):
         # The bitrate is removed from the tsp command line. It will be automatically
         # computed by tsp from the PCR in the transport stream from ffmpeg.
         tsp_cmd = [
-            self.tsp_path.get(), "-v",
-            "-b", self.mux_rate_var.get(),
+            tsp_path, "-v",
+            "-b", mux_rate,
             "-I", "file", "-",
         ]
 
-        tdt_source_str = f"{self.tdt_ip.get()}:{self.tdt_port.get()}"
+        tdt_source_str = f"{tdt_ip}:{tdt_port}"
         # Add datainject plugin to listen for external TDT/TOT from tdt.exe for time synchronization
         tsp_cmd.extend(["-P", "datainject", "-r", "-s", tdt_source_str, "-b", "50000", "-p", "0x14"])
 
         # Use the user-defined analysis file path, or default to the temp directory
-        analysis_path = self.analysis_file_path.get()
+        analysis_path = analysis_file
         if not analysis_path:
             analysis_path = os.path.join(tempfile.gettempdir(), "spts_analysis.txt")
 
@@ -2632,14 +3223,26 @@ class HackDvbGui(tk.Tk):
 
         tsp_cmd.extend([
             "-P", "nit", "--create", "--build-service-list-descriptors", "--network-id", "0xFF01",
-            "-O", "dektec", "-d", self.dek_device.get(), "--modulation", self.dek_mod_var.get(),
-            "-f", output_freq_hz, "--convolutional-rate", self.dek_fec_var.get(), "--symbol-rate", self.dek_symrate.get(), "--stuffing"
+            "-O", "dektec", "-d", dek_device, "--modulation", dek_mod,
+            "-f", output_freq_hz, "--convolutional-rate", dek_fec, "--symbol-rate", dek_symrate, "--stuffing"
         ])
 
-        return ffmpeg_cmd, tsp_cmd
+        return tsp_cmd
 
     def apply_configuration(self, config):
         """Helper function to set UI elements from a loaded config dictionary."""
+        self._loading_project = True
+        self.configure(cursor='watch') # Loading many channels takes a moment
+        self.update_idletasks()
+        try:
+            self._apply_configuration(config)
+        finally:
+            self._loading_project = False
+            self.configure(cursor='')
+        self.update_idletasks() # Lay out all the new channel cards in one pass
+        self.update_command_preview()
+
+    def _apply_configuration(self, config):
         # Set executable paths first, as other parts might depend on them
         paths = config.get("paths", {})
         self.ffmpeg_path.set(paths.get("ffmpeg", "ffmpeg"))
@@ -2661,6 +3264,7 @@ class HackDvbGui(tk.Tk):
         self.update_hw_accel_options() # Update dependent dropdowns
         self.video_codec.set(enc.get("video_codec", "mpeg2video"))
         self.preset.set(enc.get("preset", "medium"))
+        self.encoder_threads.set(enc.get("threads", "Auto"))
         self.pix_fmt.set(enc.get("pixel_format", "yuv420p"))
         self.aspect_ratio.set(enc.get("aspect_ratio", "4:3"))
         self.video_format_display.set(enc.get("video_format", "720x576i @ 25 fps (PAL SD)"))
@@ -2692,9 +3296,9 @@ class HackDvbGui(tk.Tk):
             
             # Restore probed track data if it exists in the config
             if "audio_track_map" in ch_conf:
-                new_channel["audio_track_map"] = ch_conf.get("audio_track_map", {"Default Audio": ("a:0", "und")})
+                new_channel["audio_track_map"] = ch_conf["audio_track_map"]
             if "selected_audio_specifiers" in ch_conf:
-                new_channel["selected_audio_specifiers"] = ch_conf.get("selected_audio_specifiers", ["a:0"])
+                new_channel["selected_audio_specifiers"] = ch_conf["selected_audio_specifiers"]
             if "subtitle_track_map" in ch_conf:
                 new_channel["subtitle_track_map"] = ch_conf["subtitle_track_map"]
                 new_channel["subtitle_track_combobox"]['values'] = list(ch_conf["subtitle_track_map"].keys())
@@ -2707,21 +3311,37 @@ class HackDvbGui(tk.Tk):
                     new_channel["playlist_listbox"].insert(tk.END, f)
 
 
-    def update_command_preview(self):
+    def update_command_preview(self, *args):
+        """
+        Schedules a refresh of the command preview. Many settings change together (e.g. when the
+        input type is switched), so the rebuild is debounced to run once after the changes settle.
+        """
+        self._cmd_dirty = True
+        if self._loading_project:
+            return # apply_configuration refreshes the preview once it is done
+        if self._preview_after_id:
+            self.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.after(150, self._do_update_command_preview)
+
+    def _do_update_command_preview(self, force=False):
+        """Rebuilds the command preview if a setting changed (always when forced, e.g. by the Preview button)."""
+        self._preview_after_id = None
+        if not (self._cmd_dirty or force):
+            return
+        if not force and not self.command_preview.winfo_viewable():
+            return # Stays dirty; rebuilt when the pane is shown again
+        self._cmd_dirty = False
         try:
             ffmpeg_cmd, tsp_cmd = self.get_command()
             # Create a readable string for the text box, quoting arguments with spaces
-            def quote_arg(arg):
-                return f'"{arg}"' if ' ' in arg else arg
-            ffmpeg_cmd = [quote_arg(arg) for arg in ffmpeg_cmd]
-            tsp_cmd = [quote_arg(arg) for arg in tsp_cmd]
-            full_command_str = " ".join(ffmpeg_cmd) + " | " + " ".join(tsp_cmd)
+            full_command_str = " ".join(map(_quote_arg, ffmpeg_cmd)) + " | " + " ".join(map(_quote_arg, tsp_cmd))
+        except Exception as e:
+            full_command_str = f"Error generating command: {e}"
 
+        if full_command_str != self._preview_text: # Leave the Text widget alone if nothing changed
+            self._preview_text = full_command_str
             self.command_preview.delete("1.0", tk.END)
             self.command_preview.insert(tk.END, full_command_str)
-        except Exception as e:
-            self.command_preview.delete("1.0", tk.END)
-            self.command_preview.insert(tk.END, f"Error generating command: {e}")
 
     def export_command(self):
         """Saves the generated command to a script or text file."""
@@ -2737,8 +3357,8 @@ class HackDvbGui(tk.Tk):
             # For .sh, this is generally safe.
             return f'"{arg}"' if ' ' in arg and not (arg.startswith('"') and arg.endswith('"')) else arg
 
-        ffmpeg_str = " ".join([quote_arg(arg) for arg in ffmpeg_cmd])
-        tsp_str = " ".join([quote_arg(arg) for arg in tsp_cmd])
+        ffmpeg_str = " ".join(map(quote_arg, ffmpeg_cmd))
+        tsp_str = " ".join(map(quote_arg, tsp_cmd))
         full_command = f"{ffmpeg_str} | {tsp_str}"
 
         # Suggest appropriate file types based on OS
@@ -2767,20 +3387,29 @@ class HackDvbGui(tk.Tk):
             messagebox.showerror("Error", f"Failed to export command file: {e}", parent=self)
 
     def process_log_queue(self):
+        lines = []
         try:
             while True:
-                line = self.log_queue.get_nowait()
-                self.log_message(line)
+                lines.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
         finally:
+            if lines: # One insert per tick; nothing to redraw when idle
+                self.log_message("".join(lines))
             self.after(100, self.process_log_queue)
 
     def stream_reader(self, stream, prefix):
-        """Reads a stream line by line and puts it into the queue, handling potential decoding errors."""
+        """Reads a binary stream in chunks and queues its complete lines, handling potential decoding errors."""
+        line_decoder = LogLineDecoder()
         try:
-            for line in iter(stream.readline, ''):
-                self.log_queue.put(f"{prefix}: {line}")
+            while True:
+                # read1 returns whatever is available, so a burst of output becomes one queue entry
+                chunk = stream.read1(65536)
+                lines = line_decoder.feed(chunk)
+                if lines:
+                    self.log_queue.put("".join([f"{prefix}: {line}\n" for line in lines]))
+                if not chunk:
+                    break
         finally:
             stream.close()
 
@@ -2797,14 +3426,19 @@ class HackDvbGui(tk.Tk):
 
             # Start the external TDT injector
             tdt_cmd = [self.tdt_path.get(), self.tdt_port.get()]
-            self.tdt_process = subprocess.Popen(tdt_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', bufsize=1, creationflags=subprocess.CREATE_NO_WINDOW)
+            self.tdt_process = subprocess.Popen(tdt_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=65536, **_TREE_POPEN_KWARGS)
             threading.Thread(target=self.stream_reader, args=(self.tdt_process.stderr, "TDT"), daemon=True).start()
 
-            p1 = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', bufsize=1, creationflags=subprocess.CREATE_NO_WINDOW)
-            p2 = subprocess.Popen(tsp_cmd, stdin=p1.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', bufsize=1, creationflags=subprocess.CREATE_NO_WINDOW)
-
-            # Allow p1 to receive a SIGTERM if p2 closes the pipe
-            p1.stdout.close()
+            # Connect ffmpeg to tsp through a pipe with a large buffer. The default 64 KiB
+            # buffer fills quickly at broadcast bitrates and forces constant context switches.
+            ts_read_fd, ts_write_fd = create_ts_pipe()
+            try:
+                p1 = subprocess.Popen(ffmpeg_cmd, stdout=ts_write_fd, stderr=subprocess.PIPE, bufsize=65536, startupinfo=_STARTUPINFO, creationflags=subprocess.CREATE_NO_WINDOW)
+                p2 = subprocess.Popen(tsp_cmd, stdin=ts_read_fd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=65536, startupinfo=_STARTUPINFO, creationflags=subprocess.CREATE_NO_WINDOW)
+            finally:
+                # Close our copies so p1 receives a SIGPIPE if p2 closes the pipe
+                os.close(ts_read_fd)
+                os.close(ts_write_fd)
             self.process = (p1, p2)
 
             # Start threads to read stderr from both processes
@@ -2869,15 +3503,11 @@ class HackDvbGui(tk.Tk):
 
         # Clean up any temporary playlist concat files
         for channel in self.channels:
-            temp_path = channel.pop("temp_concat_path", None)
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except OSError:
-                    pass # Ignore errors on cleanup
+            channel.pop("temp_concat_path", None)
+        self._remove_temp_concat_files()
         if self.tdt_process:
             try:
-                self.tdt_process.terminate()
+                terminate_process_tree(self.tdt_process)
             except ProcessLookupError:
                 pass
             self.status_label.config(text="Status: Stopped")
@@ -2887,9 +3517,28 @@ class HackDvbGui(tk.Tk):
         # self.preview_button.config(state=tk.NORMAL)
         self.clear_log_button.config(state=tk.NORMAL)
 
+    def _remove_temp_concat_files(self):
+        """Deletes every playlist concat file written by get_command, including those of removed channels."""
+        for path in list(self._temp_concat_paths):
+            remove_file_quietly(path)
+        self._temp_concat_paths.clear()
+
+    def _terminate_tree_processes(self):
+        """Terminates every running media tool and TDT process, with their children."""
+        self._tool_cancel.set() # Don't start any queued tool files
+        for process in (*self.tool_processes, self.tdt_process):
+            if process is None:
+                continue
+            try:
+                terminate_process_tree(process)
+            except (ProcessLookupError, OSError):
+                pass # Process already finished
+
     def on_closing(self):
         """Handles the window closing event to ensure child processes are killed."""
         self.stop_process() # This will terminate ffmpeg and tsp if they are running
+        self._terminate_tree_processes() # Media tool jobs aren't covered by stop_process
+        self._probe_pool.shutdown(wait=False, cancel_futures=True)
         self.destroy()      # This closes the Tkinter window
 
     def _create_media_tools_ui(self, parent_tab):
@@ -2916,6 +3565,9 @@ class HackDvbGui(tk.Tk):
         files_frame.grid_columnconfigure(0, weight=1)
 
         ttk.Label(files_frame, text="Input Files:").grid(row=0, column=0, sticky='w')
+        # The Python list is the model; the listbox only mirrors it for display and selection.
+        # Tk's listbox already draws only the visible rows, so it scales to large batches.
+        self._tool_files = []
         self.tool_files_listbox = tk.Listbox(files_frame, height=6, selectmode=tk.EXTENDED)
         self.tool_files_listbox.grid(row=1, column=0, sticky="nsew") # noqa: E501
         ToolTip(self.tool_files_listbox, "List of input files for the selected tool.")
@@ -2929,7 +3581,7 @@ class HackDvbGui(tk.Tk):
         add_btn.pack(side=tk.LEFT); ToolTip(add_btn, "Add one or more media files to process.")
         remove_btn = ttk.Button(files_buttons_frame, text="Remove", command=self.remove_tool_files)
         remove_btn.pack(side=tk.LEFT, padx=5); ToolTip(remove_btn, "Remove the selected file(s) from the list.")
-        clear_btn = ttk.Button(files_buttons_frame, text="Clear List", command=lambda: self.tool_files_listbox.delete(0, tk.END))
+        clear_btn = ttk.Button(files_buttons_frame, text="Clear List", command=self.clear_tool_files)
         clear_btn.pack(side=tk.LEFT); ToolTip(clear_btn, "Remove all files from the list.")
 
         # --- Settings ---
@@ -3010,7 +3662,7 @@ class HackDvbGui(tk.Tk):
         self.tool_resolution_map = {}
         for display_text, (res, scan, fr) in self.video_format_map.items():
             # Remove the frame rate part (e.g., " @ 25 fps") from the display text for the tool
-            new_display_text = re.sub(r'\s*@\s*[\d\.]+\s*fps', '', display_text)
+            new_display_text = _FR_RE.sub('', display_text)
             # Map the new display text to the resolution and scan type
             # The scan type from the main map needs to be converted to 'p' or 'i'
             scan_char = 'i' if scan != 'prog' else 'p'
@@ -3022,23 +3674,24 @@ class HackDvbGui(tk.Tk):
         self.tool_resolution_map["704x576i (PAL Anamorphic)"] = ("704x576", "i")
         self.tool_resolution_map["704x480i (NTSC Anamorphic)"] = ("704x480", "i")
 
-
-        # Remove duplicates by converting to a dict and back to a list
-        unique_keys = list(dict.fromkeys(self.tool_resolution_map.keys()))
+        # Dict keys are already unique and keep insertion order
+        unique_keys = list(self.tool_resolution_map)
 
         default_tool_res = "1920x1080p (Full HD)"
         self.converter_resolution_display = tk.StringVar(value=default_tool_res)
-        ttk.Label(self.converter_settings_frame, text="Resolution:").grid(row=5, column=0, sticky='w', padx=5, pady=(5,0))
-        resolution_combo = ttk.Combobox(self.converter_settings_frame, textvariable=self.converter_resolution_display, values=unique_keys, state="readonly") # noqa: E501
-        ToolTip(resolution_combo, "Select the output resolution and scan type.")
-        resolution_combo.grid(row=5, column=1, sticky='ew', pady=(5,0))
+        self.converter_resolution_label = ttk.Label(self.converter_settings_frame, text="Resolution:")
+        self.converter_resolution_label.grid(row=5, column=0, sticky='w', padx=5, pady=(5,0))
+        self.converter_resolution_combo = ttk.Combobox(self.converter_settings_frame, textvariable=self.converter_resolution_display, values=unique_keys, state="readonly") # noqa: E501
+        ToolTip(self.converter_resolution_combo, "Select the output resolution and scan type.")
+        self.converter_resolution_combo.grid(row=5, column=1, sticky='ew', pady=(5,0))
 
         framerate_opts = ["24", "25", "29.97", "30", "50", "59.94", "60"]
         self.converter_framerate = tk.StringVar(value="25")
-        ttk.Label(self.converter_settings_frame, text="Frame Rate:").grid(row=5, column=2, sticky='w', padx=(15, 5), pady=(5,0))
-        framerate_combo = ttk.Combobox(self.converter_settings_frame, textvariable=self.converter_framerate, values=framerate_opts) # noqa: E501
-        ToolTip(framerate_combo, "Select the output frame rate.")
-        framerate_combo.grid(row=5, column=3, sticky='ew', pady=(5,0))
+        self.converter_framerate_label = ttk.Label(self.converter_settings_frame, text="Frame Rate:")
+        self.converter_framerate_label.grid(row=5, column=2, sticky='w', padx=(15, 5), pady=(5,0))
+        self.converter_framerate_combo = ttk.Combobox(self.converter_settings_frame, textvariable=self.converter_framerate, values=framerate_opts) # noqa: E501
+        ToolTip(self.converter_framerate_combo, "Select the output frame rate.")
+        self.converter_framerate_combo.grid(row=5, column=3, sticky='ew', pady=(5,0))
 
         default_pix_fmt = "yuv420p"
         self.converter_pix_fmt = tk.StringVar(value=default_pix_fmt)
@@ -3048,12 +3701,6 @@ class HackDvbGui(tk.Tk):
         ToolTip(self.converter_pix_fmt_combo, "Select the pixel format (color space and bit depth).")
         self.converter_pix_fmt_combo.grid(row=5, column=5, sticky='ew', pady=(5,0))
 
-        # Hide resolution/framerate for anamorphic converter initially
-        self.converter_resolution_label = self.converter_settings_frame.grid_slaves(row=5, column=0)[0]
-        self.converter_resolution_combo = self.converter_settings_frame.grid_slaves(row=5, column=1)[0]
-        self.converter_framerate_label = self.converter_settings_frame.grid_slaves(row=5, column=2)[0]
-        self.converter_framerate_combo = self.converter_settings_frame.grid_slaves(row=5, column=3)[0]
-
         # --- Row 6: Video Bitrate and Aspect Ratio ---
         self.converter_vbitrate = tk.StringVar(value="6000")
         ttk.Label(self.converter_settings_frame, text="Video Bitrate (k):").grid(row=6, column=0, sticky='w', padx=5, pady=(5,0))
@@ -3077,6 +3724,28 @@ class HackDvbGui(tk.Tk):
         ToolTip(self.subtitle_rip_format_combo, "Select the output format for the extracted subtitle files.")
         self.subtitle_rip_format_combo.grid(row=7, column=1, sticky='ew', pady=(5,0))
 
+        # Settings shown by each tool; on_tool_type_change only touches widgets whose state changes
+        subtitle_widgets = [self.subtitle_rip_format_label, self.subtitle_rip_format_combo]
+        video_converter_widgets = [w for w in self.converter_settings_frame.winfo_children() if w not in subtitle_widgets]
+        video_only_widgets = {
+            self.converter_resolution_label, self.converter_resolution_combo,
+            self.converter_framerate_label, self.converter_framerate_combo,
+            self.converter_aspect_label, self.converter_aspect_combo,
+            self.converter_pix_fmt_label, self.converter_pix_fmt_combo,
+        }
+        self._tool_visibility = {
+            "Video Converter": video_converter_widgets,
+            "Bitrate Converter": [w for w in video_converter_widgets if w not in video_only_widgets],
+            "Remux to TS": [self.converter_framerate_label, self.converter_framerate_combo],
+            "Subtitle Ripper": subtitle_widgets,
+        }
+        self._tool_start_texts = {
+            "Video Converter": "Start Conversion",
+            "Bitrate Converter": "Start Re-encoding",
+            "Remux to TS": "Start Remuxing",
+            "Subtitle Ripper": "Start Ripping",
+        }
+        self._tool_shown_widgets = set(self.converter_settings_frame.winfo_children()) # Everything starts gridded
 
         # --- Progress Bar ---
         progress_frame = ttk.Frame(tools_frame)
@@ -3112,53 +3781,17 @@ class HackDvbGui(tk.Tk):
     def on_tool_type_change(self, event=None):
         """Shows or hides settings based on the selected tool."""
         selected_tool = self.tool_type.get()
-        # Hide all settings widgets by default
-        for child in self.converter_settings_frame.winfo_children():
-            child.grid_remove()
-
-        if selected_tool in ["Video Converter", "Bitrate Converter"]:
-            # Show all settings widgets
-            for child in self.converter_settings_frame.winfo_children():
-                child.grid()
-
-            if selected_tool == "Video Converter":
-                # Show resolution/framerate
-                self.converter_resolution_label.grid()
-                self.converter_resolution_combo.grid()
-                # Ensure framerate is visible
-                self.converter_framerate_label.grid()
-                self.converter_framerate_combo.grid()
-
-                self.converter_framerate_label.grid()
-                self.converter_framerate_combo.grid()
-                self.converter_aspect_label.grid()
-                self.converter_aspect_combo.grid()
-                self.converter_pix_fmt_label.grid()
-                self.converter_pix_fmt_combo.grid()
-                self.tool_start_button.config(text="Start Conversion")
-            else: # Bitrate Converter
-                # Hide resolution/framerate as they are not needed for this tool
-                self.converter_resolution_label.grid_remove()
-                self.converter_resolution_combo.grid_remove()
-                self.converter_framerate_label.grid_remove()
-                self.converter_framerate_combo.grid_remove()
-                self.converter_aspect_label.grid_remove()
-                self.converter_aspect_combo.grid_remove()
-                self.converter_pix_fmt_label.grid_remove()
-                self.converter_pix_fmt_combo.grid_remove()
-                self.tool_start_button.config(text="Start Re-encoding")
-        elif selected_tool == "Remux to TS":
-            # Only show the framerate option for remuxing
-            self.converter_framerate_label.grid()
-            self.converter_framerate_combo.grid()
-            self.tool_start_button.config(text="Start Remuxing")
-        elif selected_tool == "Subtitle Ripper":
-            # Only show the subtitle format option
-            self.subtitle_rip_format_label.grid()
-            self.subtitle_rip_format_combo.grid()
-            self.tool_start_button.config(text="Start Ripping")
-
-
+        target = self._tool_visibility.get(selected_tool)
+        if target is None:
+            return
+        target_set = set(target)
+        for widget in self._tool_shown_widgets - target_set:
+            widget.grid_remove()
+        for widget in target:
+            if widget not in self._tool_shown_widgets:
+                widget.grid()
+        self._tool_shown_widgets = target_set
+        self.tool_start_button.config(text=self._tool_start_texts[selected_tool])
 
     def update_tool_audio_options(self, *args):
         """Updates audio bitrate and sample rate options for the Tools tab."""
@@ -3170,12 +3803,12 @@ class HackDvbGui(tk.Tk):
 
         # Update bitrates
         self.converter_abitrate_combobox['values'] = options["bitrates"]
-        if self.converter_abitrate.get() not in options["bitrates"]:
+        if self.converter_abitrate.get() not in options["bitrates_set"]:
             self.converter_abitrate.set(options["default_bitrate"])
 
         # Update sample rates
         self.converter_asamplerate_combobox['values'] = options["samplerates"]
-        if self.converter_asamplerate.get() not in options["samplerates"]:
+        if self.converter_asamplerate.get() not in options["samplerates_set"]:
             self.converter_asamplerate.set(options["samplerates"][0])
 
     def update_tool_hw_accel_options(self, *args):
@@ -3206,7 +3839,7 @@ class HackDvbGui(tk.Tk):
 
         # --- Update Preset Dropdown ---
         self.converter_preset_combobox['values'] = self.preset_map[encoder_type]
-        if self.converter_preset.get() not in self.preset_map[encoder_type]:
+        if self.converter_preset.get() not in self.preset_set_map[encoder_type]:
             # Set a sensible default for the new encoder type
             default_preset = "medium" if encoder_type != "cuda" else "p4 (medium)"
             self.converter_preset.set(default_preset)
@@ -3216,16 +3849,29 @@ class HackDvbGui(tk.Tk):
 
     def add_tool_files(self):
         files = filedialog.askopenfilenames(title="Select media files", filetypes=[("Video Files", "*.mp4 *.mkv *.mov *.ts *.avi"), ("All files", "*.*")])
-        for f in files:
-            self.tool_files_listbox.insert(tk.END, f)
+        if files:
+            self._tool_files.extend(files)
+            self.tool_files_listbox.insert(tk.END, *files) # One Tcl call for the whole selection
 
     def remove_tool_files(self):
         selected_indices = self.tool_files_listbox.curselection()
-        for i in reversed(selected_indices):
-            self.tool_files_listbox.delete(i)
+        # Delete each contiguous run of selected rows with one call, last run first so indices stay valid
+        runs = []
+        for i in selected_indices:
+            if runs and runs[-1][1] == i - 1:
+                runs[-1][1] = i
+            else:
+                runs.append([i, i])
+        for first, last in reversed(runs):
+            del self._tool_files[first:last + 1]
+            self.tool_files_listbox.delete(first, last)
+
+    def clear_tool_files(self):
+        self._tool_files.clear()
+        self.tool_files_listbox.delete(0, tk.END)
 
     def start_tool_processing(self):
-        files_to_process = self.tool_files_listbox.get(0, tk.END)
+        files_to_process = tuple(self._tool_files) # Snapshot; the list may change while the tool runs
         if not files_to_process:
             messagebox.showwarning("No Files", "Please add files to the list before starting.")
             return
@@ -3235,68 +3881,306 @@ class HackDvbGui(tk.Tk):
         self.tool_start_button.config(state=tk.DISABLED)
         self.tool_stop_button.config(state=tk.NORMAL)
 
-        thread = threading.Thread(target=self.run_tool_thread, args=(files_to_process,), daemon=True)
+        self._tool_cancel.clear() # Safe: Start is only enabled once the previous run's thread has exited
+
+        def run():
+            try:
+                self.run_tool_thread(files_to_process)
+            finally:
+                self.after(0, self._on_tool_run_finished)
+
+        thread = threading.Thread(target=run, daemon=True)
         thread.start()
 
     def stop_tool_processing(self):
-        if self.tool_process:
+        self._tool_cancel.set() # Don't start any queued files
+        for process in list(self.tool_processes):
             try:
-                self.tool_process.terminate()
+                terminate_process_tree(process)
                 self.tool_log.insert(tk.END, "\n--- PROCESS STOPPED BY USER ---\n")
             except ProcessLookupError:
                 pass # Process already finished
-        self.tool_process = None
+        # Start stays disabled until the run's thread has exited (see _on_tool_run_finished),
+        # so a new run can't resume this one's queued files or have its processes killed by it
+        self.tool_stop_button.config(state=tk.DISABLED)
+
+    def _on_tool_run_finished(self):
+        """Re-enables the media tool controls once run_tool_thread has exited. Main thread only."""
         self.tool_start_button.config(state=tk.NORMAL)
         self.tool_stop_button.config(state=tk.DISABLED)
 
     def _get_media_duration(self, file_path):
         """Uses ffprobe to get the duration of a media file in seconds."""
-        ffmpeg_exe = self.ffmpeg_path.get()
-        ffprobe_exe = "ffprobe"
-        if os.path.isabs(ffmpeg_exe):
-            dir_name = os.path.dirname(ffmpeg_exe)
-            ffprobe_exe = os.path.join(dir_name, "ffprobe.exe" if os.name == 'nt' else "ffprobe")
-
-        cmd = [ffprobe_exe, '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', file_path]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            return float(result.stdout.strip())
-        except (subprocess.CalledProcessError, FileNotFoundError, ValueError) as e:
-            self.tool_log.insert(tk.END, f"--- Could not get duration for {os.path.basename(file_path)}: {e} ---\n")
+            return float(self._probe(file_path)["format"]["duration"])
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError, ValueError, KeyError) as e:
+            self._tool_log_message(f"--- Could not get duration for {os.path.basename(file_path)}: {e} ---\n")
             return None
 
     def _get_media_streams(self, file_path):
         """Uses ffprobe to get stream information for a media file."""
-        ffmpeg_exe = self.ffmpeg_path.get()
-        ffprobe_exe = "ffprobe"
-        if os.path.isabs(ffmpeg_exe):
-            dir_name = os.path.dirname(ffmpeg_exe)
-            ffprobe_exe = os.path.join(dir_name, "ffprobe.exe" if os.name == 'nt' else "ffprobe")
-
-        cmd = [ffprobe_exe, '-v', 'error', '-show_streams', '-print_format', 'json', file_path]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            return json.loads(result.stdout).get("streams", [])
-        except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
-            self.tool_log.insert(tk.END, f"--- Could not probe streams for {os.path.basename(file_path)}: {e} ---\n")
-            self.tool_log.see(tk.END)
+            return self._probe(file_path).get("streams", [])
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError, ValueError) as e:
+            self._tool_log_message(f"--- Could not probe streams for {os.path.basename(file_path)}: {e} ---\n")
             return []
 
     def _tool_log_message(self, message):
-        """Helper to insert log messages from the tool thread."""
-        def inserter():
-            self.tool_log.insert(tk.END, message)
+        """
+        Helper to insert log messages from the tool threads. Messages are queued and flushed
+        to the widget in one insert at most every 33 ms, however fast ffmpeg writes.
+        """
+        self._tool_log_queue.put(message)
+        if not self._tool_log_flush_pending:
+            self._tool_log_flush_pending = True
+            self.after(33, self._flush_tool_log)
+
+    def _flush_tool_log(self):
+        self._tool_log_flush_pending = False
+        messages = []
+        try:
+            while True:
+                messages.append(self._tool_log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if messages:
+            self.tool_log.insert(tk.END, "".join(messages))
             self.tool_log.see(tk.END)
-        self.after(0, inserter)
+            self._trim_tool_log()
+
+    def _trim_tool_log(self):
+        """Keeps only the last _TOOL_LOG_MAX_LINES lines of the tool log (checked every 100 inserts)."""
+        self._tool_log_inserts += 1
+        if self._tool_log_inserts % 100:
+            return
+        lines = int(self.tool_log.index('end-1c').split('.')[0])
+        if lines > self._TOOL_LOG_MAX_LINES:
+            self.tool_log.delete('1.0', f'{lines - self._TOOL_LOG_MAX_LINES}.0')
 
     def _update_tool_progress(self, current_progress, total_progress):
-        """Updates the progress bar from a thread."""
+        """
+        Updates the progress bar from a thread. Only the latest value matters, so reports are
+        coalesced: at most one update is queued on the Tk event loop at a time.
+        """
+        self._latest_tool_progress = (current_progress, total_progress)
+        if not self._tool_progress_pending:
+            self._tool_progress_pending = True
+            self.after_idle(self._flush_tool_progress)
+
+    def _flush_tool_progress(self):
+        self._tool_progress_pending = False
+        current_progress, total_progress = self._latest_tool_progress
         self.tool_progressbar['value'] = (current_progress / total_progress) * 100
 
+    def _tool_concurrency(self, tool_type, vcodec_choice):
+        """Returns how many files a media tool may process at the same time."""
+        if tool_type == "Remux to TS":
+            return 2 # Stream copy is disk-bound; a second job hides per-file start-up latency
+        if 'nvenc' in vcodec_choice or 'qsv' in vcodec_choice:
+            # Tool jobs don't pick a GPU, so parallel NVENC sessions would all share GPU 0
+            return 1
+        # Software encoders are already multi-threaded; a few concurrent jobs fill the idle cores
+        return max(1, min(4, (os.cpu_count() or 1) // 4))
+
+    def _build_tool_cmd_template(self, tool_type):
+        """
+        Builds the file-independent part of a converter/remux tool's ffmpeg command once per batch.
+        Returns (input_options, options, output_suffix): input_options go before "-i", options go
+        between the input and the output path, which is the input's name without its extension
+        plus output_suffix.
+        """
+        input_options = []
+        if tool_type == "Bitrate Converter":
+            output_suffix = "_reencoded.mp4"
+            vcodec_choice = self.converter_vcodec.get()
+            vbitrate = self.converter_vbitrate.get()
+            acodec = self.converter_acodec.get()
+            abitrate = self.converter_abitrate.get()
+            asamplerate = self.converter_asamplerate.get()
+            resolution, scan_type = self.tool_resolution_map[self.converter_resolution_display.get()]
+            preset = self.converter_preset.get().split(" ")[0]
+            cmd = []
+
+            if 'nvenc' in vcodec_choice:
+                input_options = ['-hwaccel', 'cuda'] # Decode on the GPU too (ffmpeg falls back to software if it can't)
+                cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-rc', 'cbr', '-tune', 'hq'])
+            elif 'qsv' in vcodec_choice:
+                cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-g', '50', '-rc', 'cbr'])
+            else: # libx264
+                cmd.extend(['-c:v', vcodec_choice, '-preset', preset])
+
+            cmd.extend(['-b:v', f'{vbitrate}k', '-maxrate', f'{vbitrate}k', '-bufsize', f'{int(vbitrate)*2}k'])
+            # Bitrate converter does not change resolution or framerate
+            if scan_type == "i":
+                cmd.extend(['-flags', '+ilme+ildct'])
+            cmd.extend(['-c:a', acodec, '-b:a', f'{abitrate}k', '-ar', asamplerate, '-ac', '2'])
+            cmd.extend(_TOOL_PROGRESS_ARGS) # Output progress to stdout
+
+        elif tool_type == "Video Converter":
+            vcodec_choice = self.converter_vcodec.get()
+            
+            # Determine the best container format for the selected codec
+            container_map = {
+                "mpeg2video": ".mpg",
+                "libvpx-vp9": ".mkv"
+            }
+            output_ext = container_map.get(vcodec_choice, ".mp4")
+            output_suffix = f"_converted{output_ext}"
+
+            vbitrate = self.converter_vbitrate.get()
+            acodec = self.converter_acodec.get()
+            abitrate = self.converter_abitrate.get()
+            asamplerate = self.converter_asamplerate.get()
+            resolution, scan_type = self.tool_resolution_map[self.converter_resolution_display.get()]
+            framerate = self.converter_framerate.get()
+            preset = self.converter_preset.get().split(" ")[0]
+            aspect_ratio = self.converter_aspect_ratio.get()
+            pix_fmt = self.converter_pix_fmt.get()
+            cmd = []
+            
+            # Set SAR based on selected resolution for anamorphic output. Square-pixel resolutions
+            # need no filter: -s and -aspect below already give them a 1:1 SAR.
+            if resolution == "1440x1080":
+                cmd.extend(['-vf', 'setsar=4/3'])
+            elif resolution == "704x576": # PAL Anamorphic
+                cmd.extend(['-vf', 'setsar=16/11'])
+            elif resolution == "704x480": # NTSC Anamorphic
+                cmd.extend(['-vf', 'setsar=40/33'])
+
+            if 'nvenc' in vcodec_choice:
+                input_options = ['-hwaccel', 'cuda'] # Decode on the GPU too (ffmpeg falls back to software if it can't)
+                cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-rc', 'cbr', '-tune', 'hq'])
+            elif 'qsv' in vcodec_choice:
+                cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-g', '50', '-rc', 'cbr'])
+            else: # libx264
+                cmd.extend(['-c:v', vcodec_choice, '-preset', preset])
+
+            cmd.extend(['-b:v', f'{vbitrate}k', '-maxrate', f'{vbitrate}k', '-bufsize', f'{int(vbitrate)*2}k'])
+            cmd.extend(['-s', resolution, '-r', framerate, '-pix_fmt', pix_fmt, '-aspect', aspect_ratio])
+            if scan_type == "i":
+                cmd.extend(['-flags', '+ilme+ildct'])
+            cmd.extend(['-c:a', acodec, '-b:a', f'{abitrate}k', '-ar', asamplerate, '-ac', '2'])
+            cmd.extend(_TOOL_PROGRESS_ARGS) # Output progress to stdout
+        
+        else: # Remux to TS
+            output_suffix = ".ts"
+            framerate = self.converter_framerate.get()
+            cmd = []
+            if framerate:
+                cmd.extend(['-r', framerate])
+            cmd.extend(['-c', 'copy', '-f', 'mpegts'])
+            cmd.extend(_TOOL_PROGRESS_ARGS)
+
+        return input_options, cmd, output_suffix
+
+    def _run_tool_job(self, file_path, cmd, output_path, duration, report_progress):
+        """Runs one ffmpeg tool job, reporting its progress in seconds. Returns True on success."""
+        # stdout stays binary: progress lines are parsed straight from bytes without decoding
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=65536, **_TREE_POPEN_KWARGS)
+        self.tool_processes.add(process)
+
+        stdout_tail = b"" # Unterminated last line, completed by the next chunk
+        log_prefix = f"[{os.path.basename(file_path)}] " # Jobs run in parallel, so mark whose output each line is
+
+        def handle_stdout(chunk):
+            # Read stdout for progress; only out_time_ms is needed, and only its latest value per chunk
+            nonlocal stdout_tail
+            data = stdout_tail + chunk
+            end = data.rfind(b'\n') + 1
+            stdout_tail = data[end:]
+            if duration and end:
+                last = None
+                for last in _PROGRESS_RE.finditer(data, 0, end):
+                    pass
+                if last is not None:
+                    report_progress(int(last.group(1)) / 1_000_000)
+
+        try:
+            if os.name == 'nt':
+                # Windows pipes can't be waited on with select(), so stderr gets its own reader thread
+                def log_stderr():
+                    stderr = io.TextIOWrapper(process.stderr, encoding='utf-8', errors='replace')
+                    for line in iter(stderr.readline, ''):
+                        self._tool_log_message(log_prefix + line)
+
+                stderr_thread = threading.Thread(target=log_stderr, daemon=True)
+                stderr_thread.start()
+                for chunk in iter(partial(process.stdout.read1, 65536), b''):
+                    handle_stdout(chunk)
+                # stdout hit EOF, so ffmpeg is exiting. Let the stderr reader drain its pipe first.
+                stderr_thread.join(timeout=5)
+            else:
+                self._drain_tool_pipes(process, handle_stdout, log_prefix)
+
+            # Don't wait forever on a process that closed its output but hangs on exit
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        finally:
+            self.tool_processes.discard(process)
+        if process.returncode == 0:
+            self._tool_log_message(f"--- Successfully created {os.path.basename(output_path)} ---\n\n")
+            return True
+        self._tool_log_message(f"--- FAILED to process {os.path.basename(file_path)} ---\n\n")
+        return False
+
+    def _drain_tool_pipes(self, process, handle_stdout, log_prefix):
+        """
+        Passes a tool process's stdout chunks to handle_stdout and logs its stderr, each line
+        prefixed with log_prefix, on the calling thread until both pipes close.
+        POSIX only: it waits on both pipes with a selector.
+        """
+        stderr_decoder = LogLineDecoder()
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ)
+            selector.register(process.stderr, selectors.EVENT_READ)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                    if key.fileobj is process.stdout:
+                        handle_stdout(chunk)
+                    else:
+                        lines = stderr_decoder.feed(chunk)
+                        if lines:
+                            self._tool_log_message("".join([f"{log_prefix}{line}\n" for line in lines]))
+
+    def _rip_one_subtitle(self, ffmpeg_exe, file_path, stream_index, lang, output_codec, output_format):
+        """Extracts one subtitle stream to its own file. Returns True on success."""
+        if self._tool_cancel.is_set():
+            return True # Stopped by the user; not a failure of this track
+        output_path = f"{os.path.splitext(file_path)[0]}_track_{stream_index}_{lang}.{output_format}"
+        cmd = [ffmpeg_exe, '-hide_banner', '-y', '-i', file_path, '-map', f'0:{stream_index}', '-c:s', output_codec, output_path]
+        try:
+            # For ripping, we don't need progress, just run and wait.
+            # Only stderr is read, so communicate() services a single pipe
+            process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', **_TREE_POPEN_KWARGS)
+            self.tool_processes.add(process)
+            try:
+                _, stderr = process.communicate()
+            finally:
+                self.tool_processes.discard(process)
+        except Exception as e:
+            self._tool_log_message(f"--- ERROR ripping track {stream_index}: {e} ---\n")
+            return False
+        if process.returncode == 0:
+            self._tool_log_message(f"--- Successfully ripped track {stream_index} to {os.path.basename(output_path)} ---\n")
+            return True
+        # Each message is queued whole, so output from concurrent tracks never interleaves
+        self._tool_log_message(f"--- FAILED to rip track {stream_index}. FFmpeg says: ---\n{stderr}\n")
+        return False
+
     def run_tool_thread(self, files):
         tool_type = self.tool_type.get()
         num_files = len(files)
-        total_duration = sum(self._get_media_duration(f) or 0 for f in files)
+        # Probe all files concurrently; ffprobe start-up dominates, so threads overlap it well.
+        # This also primes the probe cache, so later per-file lookups don't re-run ffprobe
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="duration") as executor:
+            durations = list(executor.map(self._get_media_duration, files))
+        total_duration = sum(d or 0 for d in durations)
         if tool_type == "Subtitle Ripper":
             total_duration = num_files # For ripper, progress is per file
         processed_duration = 0
@@ -3304,179 +4188,105 @@ class HackDvbGui(tk.Tk):
         error_occurred = False
         final_message = ""
 
-        for i, file_path in enumerate(files):
-            self._tool_log_message(f"--- Processing file {i+1} of {num_files}: {os.path.basename(file_path)} ---\n")
-
-            duration = self._get_media_duration(file_path)
-
-            if tool_type == "Bitrate Converter":
-                output_path = f"{os.path.splitext(file_path)[0]}_reencoded.mp4"
-                vcodec_choice = self.converter_vcodec.get()
-                vbitrate = self.converter_vbitrate.get()
-                acodec = self.converter_acodec.get()
-                abitrate = self.converter_abitrate.get()
-                asamplerate = self.converter_asamplerate.get()
-                resolution, scan_type = self.tool_resolution_map[self.converter_resolution_display.get()]
-                preset = self.converter_preset.get().split(" ")[0]
-                cmd = [self.ffmpeg_path.get(), '-hide_banner', '-y', '-i', file_path]
-
-                if 'nvenc' in vcodec_choice:
-                    cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-rc', 'cbr', '-tune', 'hq'])
-                elif 'qsv' in vcodec_choice:
-                    cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-g', '50', '-rc', 'cbr'])
-                else: # libx264
-                    cmd.extend(['-c:v', vcodec_choice, '-preset', preset])
-
-                cmd.extend(['-b:v', f'{vbitrate}k', '-maxrate', f'{vbitrate}k', '-bufsize', f'{int(vbitrate)*2}k'])
-                # Bitrate converter does not change resolution or framerate
-                if scan_type == "i":
-                    cmd.extend(['-flags', '+ilme+ildct'])
-                cmd.extend(['-c:a', acodec, '-b:a', f'{abitrate}k', '-ar', asamplerate, '-ac', '2'])
-                cmd.extend(['-progress', 'pipe:1']) # Output progress to stdout
-                cmd.append(output_path)
-
-            elif tool_type == "Video Converter":
-                vcodec_choice = self.converter_vcodec.get()
-                
-                # Determine the best container format for the selected codec
-                container_map = {
-                    "mpeg2video": ".mpg",
-                    "libvpx-vp9": ".mkv"
-                }
-                output_ext = container_map.get(vcodec_choice, ".mp4")
-                output_path = f"{os.path.splitext(file_path)[0]}_converted{output_ext}"
-
-                vcodec_choice = self.converter_vcodec.get()
-                vbitrate = self.converter_vbitrate.get()
-                acodec = self.converter_acodec.get()
-                abitrate = self.converter_abitrate.get()
-                asamplerate = self.converter_asamplerate.get()
-                resolution, scan_type = self.tool_resolution_map[self.converter_resolution_display.get()]
-                framerate = self.converter_framerate.get()
-                preset = self.converter_preset.get().split(" ")[0]
-                aspect_ratio = self.converter_aspect_ratio.get()
-                pix_fmt = self.converter_pix_fmt.get()
-                cmd = [self.ffmpeg_path.get(), '-hide_banner', '-y', '-i', file_path]
-                
-                # Set SAR based on selected resolution for anamorphic output
-                if resolution == "1440x1080":
-                    cmd.extend(['-vf', 'setsar=4/3'])
-                elif resolution == "704x576": # PAL Anamorphic
-                    cmd.extend(['-vf', 'setsar=16/11'])
-                elif resolution == "704x480": # NTSC Anamorphic
-                    cmd.extend(['-vf', 'setsar=40/33'])
-                else: # Default behavior for non-anamorphic resolutions
-                    cmd.extend(['-vf', 'setsar=1/1']) # Assume square pixels
-
-                if 'nvenc' in vcodec_choice:
-                    cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-rc', 'cbr', '-tune', 'hq'])
-                elif 'qsv' in vcodec_choice:
-                    cmd.extend(['-c:v', vcodec_choice, '-preset', preset, '-g', '50', '-rc', 'cbr'])
-                else: # libx264
-                    cmd.extend(['-c:v', vcodec_choice, '-preset', preset])
-
-                cmd.extend(['-b:v', f'{vbitrate}k', '-maxrate', f'{vbitrate}k', '-bufsize', f'{int(vbitrate)*2}k'])
-                cmd.extend(['-s', resolution, '-r', framerate, '-pix_fmt', pix_fmt, '-aspect', aspect_ratio])
-                if scan_type == "i":
-                    cmd.extend(['-flags', '+ilme+ildct'])
-                cmd.extend(['-c:a', acodec, '-b:a', f'{abitrate}k', '-ar', asamplerate, '-ac', '2'])
-                cmd.extend(['-progress', 'pipe:1']) # Output progress to stdout
-                cmd.append(output_path)
-            
-            elif tool_type == "Remux to TS":
-                output_path = f"{os.path.splitext(file_path)[0]}.ts"
-                framerate = self.converter_framerate.get()
-                cmd = [self.ffmpeg_path.get(), '-hide_banner', '-y', '-i', file_path]
-                if framerate:
-                    cmd.extend(['-r', framerate])
-                cmd.extend(['-c', 'copy', '-f', 'mpegts', '-progress', 'pipe:1', output_path])
-
-            elif tool_type == "Subtitle Ripper":
-                output_format = self.subtitle_rip_format_var.get()
-                # Map the user-friendly format name to the actual ffmpeg codec name.
-                codec_map = {
-                    "srt": "srt",
-                    "ass": "ass",
-                    "vtt": "webvtt"
-                }
-                output_codec = codec_map.get(output_format, output_format)
+        if tool_type == "Subtitle Ripper":
+            ffmpeg_exe = self.ffmpeg_path.get()
+            output_format = self.subtitle_rip_format_var.get()
+            # Map the user-friendly format name to the actual ffmpeg codec name.
+            output_codec = _SUBTITLE_CODEC_MAP.get(output_format, output_format)
+            for i, file_path in enumerate(files):
+                if self._tool_cancel.is_set():
+                    break
+                self._tool_log_message(f"--- Processing file {i+1} of {num_files}: {os.path.basename(file_path)} ---\n")
                 streams = self._get_media_streams(file_path)
                 subtitle_streams = [s for s in streams if s.get('codec_type') == 'subtitle']
 
                 if not subtitle_streams:
                     self._tool_log_message(f"--- No subtitle tracks found in {os.path.basename(file_path)}. Skipping. ---\n\n")
                     processed_duration += 1 # Increment file-based progress
-                    self.after(0, self._update_tool_progress, processed_duration, total_duration)
+                    self._update_tool_progress(processed_duration, total_duration)
                     continue
 
                 self._tool_log_message(f"--- Found {len(subtitle_streams)} subtitle track(s). Ripping... ---\n")
 
-                for sub_stream in subtitle_streams:
-                    stream_index = sub_stream['index']
-                    lang = sub_stream.get('tags', {}).get('language', 'und')
-                    output_path = f"{os.path.splitext(file_path)[0]}_track_{stream_index}_{lang}.{output_format}"
-
-                    # Check if we are converting from a text-based subtitle to a bitmap-based one.
-                    # This requires a more complex filter graph to render the subtitles.
-                    cmd = [self.ffmpeg_path.get(), '-hide_banner', '-y', '-i', file_path, '-map', f'0:{stream_index}', '-c:s', output_codec, output_path]
-
-                    try:
-                        # For ripping, we don't need progress, just run and wait.
-                        self.tool_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', creationflags=subprocess.CREATE_NO_WINDOW)
-                        stdout, stderr = self.tool_process.communicate()
-                        if self.tool_process.returncode == 0:
-                            self._tool_log_message(f"--- Successfully ripped track {stream_index} to {os.path.basename(output_path)} ---\n")
-                        else:
-                            self._tool_log_message(f"--- FAILED to rip track {stream_index}. FFmpeg says: ---\n{stderr}\n")
+                # Each track goes to its own file, so the per-track ffmpeg runs can overlap
+                with ThreadPoolExecutor(max_workers=min(len(subtitle_streams), os.cpu_count() or 1), thread_name_prefix="subrip") as executor:
+                    futures = [
+                        executor.submit(self._rip_one_subtitle, ffmpeg_exe, file_path, sub_stream['index'],
+                                        sub_stream.get('tags', {}).get('language', 'und'), output_codec, output_format)
+                        for sub_stream in subtitle_streams
+                    ]
+                    for future in as_completed(futures):
+                        if not future.result():
                             error_occurred = True
-                    except Exception as e:
-                        self._tool_log_message(f"--- ERROR ripping track {stream_index}: {e} ---\n")
-                        error_occurred = True
                 self._tool_log_message("\n") # Add a newline after processing a file
                 processed_duration += 1 # Increment file-based progress
-                self.after(0, self._update_tool_progress, processed_duration, total_duration)
-                continue # Skip the generic process handling below
-            else:
-                self._tool_log_message(f"--- ERROR: Unknown tool type '{tool_type}' ---\n\n")
-                break
+                self._update_tool_progress(processed_duration, total_duration)
+
+        elif tool_type in ("Bitrate Converter", "Video Converter", "Remux to TS"):
+            # Files are independent, so several are processed at once (bounded per encoder type).
+            # Progress is the finished files' durations plus the current position of running jobs.
+            progress_lock = threading.Lock()
+            running_progress = {} # File index -> seconds processed so far
+            failures = [] # Final messages of failed files, in completion order
+
+            def fail(message):
+                failures.append(message)
+                self._tool_cancel.set() # Don't start any queued files
+                # Jobs already running would otherwise finish their whole file for a failed batch
+                for process in list(self.tool_processes):
+                    try:
+                        terminate_process_tree(process)
+                    except ProcessLookupError:
+                        pass # Process already finished
+
+            def process_file(i, file_path):
+                nonlocal processed_duration
+                if self._tool_cancel.is_set():
+                    return # Stopped by the user or by an earlier failure
+                self._tool_log_message(f"--- Processing file {i+1} of {num_files}: {os.path.basename(file_path)} ---\n")
+                duration = durations[i]
+
+                def report_progress(current_time_s):
+                    with progress_lock:
+                        running_progress[i] = current_time_s
+                        current = processed_duration + sum(running_progress.values())
+                    self._update_tool_progress(current, total_duration)
 
-            try:
-                self.tool_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', creationflags=subprocess.CREATE_NO_WINDOW)
-                
-                # Thread to read stderr and log it
-                def log_stderr():
-                    for line in iter(self.tool_process.stderr.readline, ''):
-                        self._tool_log_message(line)
-                
-                stderr_thread = threading.Thread(target=log_stderr, daemon=True)
-                stderr_thread.start()
+                try:
+                    output_path = os.path.splitext(file_path)[0] + output_suffix
+                    cmd = [*cmd_prefix, *input_options, '-i', file_path, *tool_options, output_path]
+                    succeeded = self._run_tool_job(file_path, cmd, output_path, duration, report_progress)
+                except Exception as e:
+                    self._tool_log_message(f"--- ERROR: {e} ---\n\n")
+                    fail(f"An unexpected error occurred: {e}") # Stop on error
+                    return
+                if not succeeded:
+                    fail(f"Processing failed on file: {os.path.basename(file_path)}.\nCheck the log for details.") # Stop on failure
+                    return
+                with progress_lock:
+                    running_progress.pop(i, None)
+                    if duration:
+                        processed_duration += duration
 
-                # Read stdout for progress
-                for line in iter(self.tool_process.stdout.readline, ''):
-                    if 'out_time_ms=' in line and duration:
-                        try:
-                            current_time_ms = int(line.strip().split('=')[1])
-                            current_time_s = current_time_ms / 1_000_000
-                            self.after(0, self._update_tool_progress, processed_duration + current_time_s, total_duration)
-                        except (ValueError, IndexError):
-                            continue # Ignore malformed progress lines
-
-                self.tool_process.wait()
-                if self.tool_process.returncode == 0:
-                    self._tool_log_message(f"--- Successfully created {os.path.basename(output_path)} ---\n\n")
-                else:
-                    self._tool_log_message(f"--- FAILED to process {os.path.basename(file_path)} ---\n\n")
-                    error_occurred = True
-                    final_message = f"Processing failed on file: {os.path.basename(file_path)}.\nCheck the log for details."
-                    break # Stop on failure
+            # The settings are the same for every file: read them once and build the command around them
+            try:
+                input_options, tool_options, output_suffix = self._build_tool_cmd_template(tool_type)
             except Exception as e:
                 self._tool_log_message(f"--- ERROR: {e} ---\n\n")
+                self.after(0, messagebox.showerror, "Task Failed", f"An unexpected error occurred: {e}")
+                return
+            cmd_prefix = (self.ffmpeg_path.get(), '-hide_banner', '-y')
+
+            workers = self._tool_concurrency(tool_type, self.converter_vcodec.get())
+            with ThreadPoolExecutor(max_workers=min(workers, num_files), thread_name_prefix="tool") as executor:
+                for i, file_path in enumerate(files):
+                    executor.submit(process_file, i, file_path)
+            if failures:
                 error_occurred = True
-                final_message = f"An unexpected error occurred: {e}"
-                break # Stop on error
-            
-            if duration:
-                processed_duration += duration
+                final_message = failures[0]
+
+        else:
+            self._tool_log_message(f"--- ERROR: Unknown tool type '{tool_type}' ---\n\n")
 
         # After the loop, show a final status message box on the main thread
         if not error_occurred:
@@ -3485,45 +4295,48 @@ class HackDvbGui(tk.Tk):
         else:
             self.after(0, messagebox.showerror, "Task Failed", final_message)
 
-        self.after(0, self.stop_tool_processing)
-
     def delete_eit_file(self):
         """Finds and deletes all .xml files in the system's temp directory."""
         temp_dir = tempfile.gettempdir()
         try:
-            # Find all files ending with .xml in the temp directory
-            xml_files = [f for f in os.listdir(temp_dir) if f.endswith('.xml') and os.path.isfile(os.path.join(temp_dir, f))]
+            # Find all files ending with .xml in the temp directory. scandir's entries already know
+            # their type, so this avoids a stat call per file in a (possibly huge) temp directory.
+            with os.scandir(temp_dir) as entries:
+                xml_entries = [(e.name, e.path) for e in entries if e.name.endswith('.xml') and e.is_file()]
         except OSError as e:
             messagebox.showerror("Error", f"Could not read temporary directory: {e}", parent=self)
             return
 
-        if not xml_files:
+        if not xml_entries:
             messagebox.showinfo("No Files Found", "No temporary .xml files were found to delete.", parent=self)
             return
 
         # Prepare confirmation message
-        file_list_str = "\n".join(f"- {f}" for f in xml_files[:10]) # Show up to 10 files
-        if len(xml_files) > 10:
-            file_list_str += f"\n... and {len(xml_files) - 10} more."
+        file_list_str = "\n".join(f"- {name}" for name, _ in xml_entries[:10]) # Show up to 10 files
+        if len(xml_entries) > 10:
+            file_list_str += f"\n... and {len(xml_entries) - 10} more."
 
-        confirm_msg = f"Are you sure you want to delete these {len(xml_files)} file(s) from the temporary directory?\n\n{file_list_str}"
+        confirm_msg = f"Are you sure you want to delete these {len(xml_entries)} file(s) from the temporary directory?\n\n{file_list_str}"
 
         if messagebox.askyesno("Confirm Deletion", confirm_msg, parent=self):
-            deleted_count = 0
-            errors = []
-            for filename in xml_files:
-                file_path = os.path.join(temp_dir, filename)
+            def delete_one(file_path):
+                """Deletes one file and returns its log line and whether it succeeded."""
                 try:
                     os.remove(file_path)
-                    self.log_message(f"Deleted temporary EPG file: {file_path}\n")
-                    deleted_count += 1
+                    return f"Deleted temporary EPG file: {file_path}\n", True
                 except OSError as e:
-                    errors.append(filename)
-                    self.log_message(f"ERROR: Failed to delete {file_path}: {e}\n")
-            
+                    return f"ERROR: Failed to delete {file_path}: {e}\n", False
+
+            # Unlinking is I/O-bound (and slow under Windows virus scanners), so overlap it.
+            # Results keep the listing order and are logged in one go.
+            with ThreadPoolExecutor(max_workers=min(16, len(xml_entries)), thread_name_prefix="unlink") as executor:
+                results = list(executor.map(delete_one, [path for _, path in xml_entries]))
+            self.log_message("".join([line for line, _ in results]))
+            deleted_count = sum(ok for _, ok in results)
+
             self.eit_path.set("") # Clear the path in the UI regardless
             self.update_command_preview()
-            messagebox.showinfo("Deletion Complete", f"Successfully deleted {deleted_count} of {len(xml_files)} file(s).", parent=self)
+            messagebox.showinfo("Deletion Complete", f"Successfully deleted {deleted_count} of {len(xml_entries)} file(s).", parent=self)
 
     def open_epg_editor(self):
         """Opens the Toplevel window for creating and editing EPG events."""
@@ -3545,6 +4358,7 @@ class HackDvbGui(tk.Tk):
                     # when loading a file that was just auto-generated.
                     self.epg_events.clear()
                     self.epg_events.extend(parsed_events)
+                    self._epg_titles_lc = None
                     self.log_message(f"Loaded and merged {len(parsed_events)} events from {existing_eit_path}\n")
                 except Exception as e:
                     messagebox.showerror("Parse Error", f"Failed to parse the XML file: {e}")
@@ -3565,53 +4379,61 @@ class HackDvbGui(tk.Tk):
     def _parse_eit_xml(self, xml_path):
         """Parses a TSDuck EIT XML file and returns a list of event dictionaries."""
         new_events = []
-        pid_to_channel_name = {ch['pid'].get(): ch['name'].get() for ch in self.channels}
-
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-
-        for eit_table in root.findall('EIT'):
-            service_id = eit_table.get('service_id')
-            channel_name = pid_to_channel_name.get(service_id)
-            if not channel_name:
-                continue # Skip events for services not currently in the UI
+        pid_to_channel_name = self._get_pid_to_channel_name()
+
+        # Stream the file: each event is handled as soon as it is complete and then discarded,
+        # so a week-long EIT file never has to be held in memory as a whole tree.
+        channel_name = None
+        for xml_event, node in ET.iterparse(xml_path, events=('start', 'end')):
+            tag = node.tag
+            if xml_event == 'start':
+                if tag == 'EIT':
+                    # Events of services not currently in the UI are skipped
+                    channel_name = pid_to_channel_name.get(node.get('service_id'))
+                continue
+            if tag == 'EIT':
+                channel_name = None
+                node.clear()
+                continue
+            if tag != 'event' or not channel_name:
+                continue
 
-            for event_node in eit_table.findall('event'):
-                event_data = {"channel": channel_name}
-                try:
-                    # Time and Duration
-                    start_str = event_node.get('start_time')
-                    duration_str = event_node.get('duration')
-                    start_time = datetime.strptime(start_str, "%Y-%m-%d %H:%M:%S")
-                    h, m, s = map(int, duration_str.split(':'))
-                    end_time = start_time + timedelta(hours=h, minutes=m, seconds=s)
-                    event_data['start'] = start_time
-                    event_data['end'] = end_time
-
-                    # Descriptors
-                    short_desc_node = event_node.find('short_event_descriptor')
-                    if short_desc_node is not None:
-                        event_data['title'] = short_desc_node.find('event_name').text or ""
-                        event_data['short_desc'] = short_desc_node.find('text').text or ""
-                        event_data['language'] = short_desc_node.get('language_code', 'eng')
-
-                    ext_desc_node = event_node.find('extended_event_descriptor')
-                    event_data['ext_desc'] = ext_desc_node.find('text').text if ext_desc_node is not None and ext_desc_node.find('text') is not None else ""
-
-                    content_node = event_node.find('content_descriptor/content')
-                    if content_node is not None:
-                        event_data['nibble1'] = int(content_node.get('content_nibble_level_1', 15))
-                        event_data['nibble2'] = int(content_node.get('content_nibble_level_2', 0))
-
-                    parental_node = event_node.find('parental_rating_descriptor/country')
-                    if parental_node is not None:
-                        event_data['country_code'] = parental_node.get('country_code')
-                        rating_val = int(parental_node.get('rating'), 16)
-                        event_data['min_age'] = str(rating_val + 3) if 1 <= rating_val <= 15 else "None"
-
-                    new_events.append(event_data)
-                except (ValueError, TypeError, AttributeError) as e:
-                    self.log_message(f"Warning: Skipping malformed event in XML: {e}\n")
+            event_data = {"channel": channel_name}
+            try:
+                # Time and Duration
+                start_str = node.get('start_time')
+                duration_str = node.get('duration')
+                start_time = _fast_parse_dt(start_str)
+                end_time = start_time + _fast_parse_duration(duration_str)
+                event_data['start'] = start_time
+                event_data['end'] = end_time
+
+                # Descriptors
+                short_desc_node = node.find('short_event_descriptor')
+                if short_desc_node is not None:
+                    event_data['title'] = short_desc_node.find('event_name').text or ""
+                    event_data['short_desc'] = short_desc_node.find('text').text or ""
+                    event_data['language'] = short_desc_node.get('language_code', 'eng')
+
+                ext_desc_node = node.find('extended_event_descriptor')
+                event_data['ext_desc'] = ext_desc_node.find('text').text if ext_desc_node is not None and ext_desc_node.find('text') is not None else ""
+
+                content_node = node.find('content_descriptor/content')
+                if content_node is not None:
+                    event_data['nibble1'] = int(content_node.get('content_nibble_level_1', 15))
+                    event_data['nibble2'] = int(content_node.get('content_nibble_level_2', 0))
+
+                parental_node = node.find('parental_rating_descriptor/country')
+                if parental_node is not None:
+                    event_data['country_code'] = parental_node.get('country_code')
+                    rating_val = int(parental_node.get('rating'), 16)
+                    event_data['min_age'] = str(rating_val + 3) if 1 <= rating_val <= 15 else "None"
+
+                new_events.append(event_data)
+            except (ValueError, TypeError, AttributeError) as e:
+                self.log_message(f"Warning: Skipping malformed event in XML: {e}\n")
+            finally:
+                node.clear() # Drop the processed event's subtree
         return new_events
 
     def _setup_epg_editor_ui(self, editor):
@@ -3631,7 +4453,7 @@ class HackDvbGui(tk.Tk):
 
         # --- Search Bar ---
         search_frame = ttk.Frame(list_frame)
-        search_frame.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 10))
         search_frame.grid_columnconfigure(1, weight=1) # noqa: E501
         ttk.Label(search_frame, text="Filter:").grid(row=0, column=0, sticky="w")
         search_var = tk.StringVar()
@@ -3640,20 +4462,31 @@ class HackDvbGui(tk.Tk):
         ToolTip(search_entry, "Filter events by title (case-insensitive).")
 
         tree = ttk.Treeview(list_frame, columns=("channel", "title", "start"), show="headings")
-        tree.heading("channel", text="Channel", command=lambda: self.sort_epg_tree(tree, "channel", False))
+        tree.heading("channel", text="Channel")
         tree.heading("title", text="Title")
         tree.heading("start", text="Start Time")
         tree.column("channel", width=100)
         tree.column("title", width=150)
         tree.column("start", width=120)
         tree.grid(row=1, column=0, sticky="nsew")
+        tree_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
+        tree_scrollbar.grid(row=1, column=1, sticky="ns")
+        # The tree is filled lazily by populate_epg_tree; scrolling near the end loads the next page
+        tree.epg_sorted = [] # (index in self.epg_events, event) for all events matching the filter, in display order
+        tree.epg_loaded = 0 # How many of them have been inserted
+        tree.epg_page_pending = False
+
+        def on_tree_scroll(first, last):
+            tree_scrollbar.set(first, last)
+            self._on_epg_tree_scroll(tree, last)
+        tree.configure(yscrollcommand=on_tree_scroll)
 
         # Store references on the editor window for easy access
         editor.tree = tree
         editor.selected_event_index = None # To track which event is being edited
 
         list_buttons = ttk.Frame(list_frame)
-        list_buttons.grid(row=2, column=0, sticky="ew", pady=(10, 0))
+        list_buttons.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(10, 0))
         delete_btn = ttk.Button(list_buttons, text="Delete Selected", command=lambda: self.delete_epg_event(editor))
         delete_btn.pack(side=tk.LEFT, padx=(0, 5)); ToolTip(delete_btn, "Delete the currently selected event(s) from the list.")
         duplicate_btn = ttk.Button(list_buttons, text="Duplicate Selected", command=lambda: self.duplicate_epg_event(editor))
@@ -3665,40 +4498,35 @@ class HackDvbGui(tk.Tk):
         form_frame.grid_columnconfigure(1, weight=1)
 
         # --- Form Widgets ---
+        for row, text, sticky in _EPG_FORM_LABELS:
+            ttk.Label(form_frame, text=text).grid(row=row, column=0, sticky=sticky, pady=2)
+
         # Channel
-        ttk.Label(form_frame, text="Channel:").grid(row=0, column=0, sticky="w", pady=2)
         channel_names = [ch['name'].get() for ch in self.channels]
         event_channel = tk.StringVar(value=channel_names[0] if channel_names else "")
         channel_combo = ttk.Combobox(form_frame, textvariable=event_channel, values=channel_names, state="readonly")
         ToolTip(channel_combo, "The service (channel) this event belongs to.")
         channel_combo.grid(row=0, column=1, sticky="ew")
 
-        # Title
-        ttk.Label(form_frame, text="Title:").grid(row=1, column=0, sticky="w", pady=2)
-        event_title = tk.StringVar()
-        title_entry = ttk.Entry(form_frame, textvariable=event_title)
-        title_entry.grid(row=1, column=1, sticky="ew")
-        ToolTip(title_entry, "The main title of the event.")
-
-        # Short Description
-        ttk.Label(form_frame, text="Short Desc:").grid(row=2, column=0, sticky="w", pady=2)
-        event_short_desc = tk.StringVar()
-        short_desc_entry = ttk.Entry(form_frame, textvariable=event_short_desc)
-        short_desc_entry.grid(row=2, column=1, sticky="ew")
-        ToolTip(short_desc_entry, "A brief, one-line summary of the event.")
+        # Title and Short Description
+        entry_vars = []
+        for row, tooltip in _EPG_FORM_ENTRIES:
+            entry_var = tk.StringVar()
+            entry = ttk.Entry(form_frame, textvariable=entry_var)
+            entry.grid(row=row, column=1, sticky="ew")
+            ToolTip(entry, tooltip)
+            entry_vars.append(entry_var)
+        event_title, event_short_desc = entry_vars
 
         # Language
-        ttk.Label(form_frame, text="Language:").grid(row=3, column=0, sticky="w", pady=2)
         event_language_display = tk.StringVar(value="English")
-        lang_display_names = sorted(self.language_map.keys())
-        lang_combo = ttk.Combobox(form_frame, textvariable=event_language_display, values=lang_display_names, state="readonly") # noqa: E501
+        lang_combo = ttk.Combobox(form_frame, textvariable=event_language_display, values=self._lang_display_names, state="readonly") # noqa: E501
         ToolTip(lang_combo, "The primary language of the event.")
         lang_combo.grid(row=3, column=1, sticky="ew")
 
         # Start Time
-        ttk.Label(form_frame, text="Start Time:").grid(row=3, column=0, sticky="w", pady=2)
         start_time_frame = ttk.Frame(form_frame)
-        start_time_frame.grid(row=3, column=1, sticky="ew")
+        start_time_frame.grid(row=4, column=1, sticky="ew")
         now = datetime.now()
         event_date_var = tk.StringVar(value=now.strftime("%Y-%m-%d"))
         event_time_var = tk.StringVar(value=now.strftime("%H:%M"))
@@ -3718,10 +4546,7 @@ class HackDvbGui(tk.Tk):
         ToolTip(now_button, "Set the start time to the current date and time.")
         ToolTip(start_time_frame, "Start time in YYYY-MM-DD and HH:MM (24-hour) format.")
 
-        # Re-grid Start Time and Duration
-        form_frame.grid_slaves(row=3, column=0)[0].grid(row=4, column=0) # Start Time Label
-        start_time_frame.grid(row=4, column=1) # Start Time Frame
-        ttk.Label(form_frame, text="Duration:").grid(row=5, column=0, sticky="w", pady=2)
+        # Duration
         duration_frame = ttk.Frame(form_frame)
         duration_frame.grid(row=5, column=1, sticky="ew")
         event_dur_h_var = tk.StringVar(value="0")
@@ -3735,13 +4560,11 @@ class HackDvbGui(tk.Tk):
         ToolTip(duration_frame, "The duration of the event in hours and minutes. Maximum is 3 hours.")
         
         # Extended Description
-        ttk.Label(form_frame, text="Extended Desc:").grid(row=6, column=0, sticky="nw", pady=2)
         event_ext_desc_text = tk.Text(form_frame, height=5, width=40)
         event_ext_desc_text.grid(row=6, column=1, sticky="ew")
         ToolTip(event_ext_desc_text, "The full, detailed description of the event. Can be multiple lines.")
 
         # Content Nibbles
-        ttk.Label(form_frame, text="Content Type:").grid(row=7, column=0, sticky="w", pady=2)
         content_frame = ttk.Frame(form_frame)
         content_frame.grid(row=7, column=1, sticky="ew")
         event_nibble1_var = tk.StringVar(value="15")
@@ -3760,20 +4583,16 @@ class HackDvbGui(tk.Tk):
         ToolTip(nibble_help_btn, "Show a detailed table of DVB content nibble values.")
 
         # Parental Rating
-        ttk.Label(form_frame, text="Parental Rating:").grid(row=8, column=0, sticky="w", pady=2)
         rating_frame = ttk.Frame(form_frame)
         rating_frame.grid(row=8, column=1, sticky="ew")
         event_country_code_var = tk.StringVar(value="gbr") # This will hold the 3-letter code
         country_display_var = tk.StringVar() # This will hold the "CODE - Name" for display
         event_min_age_var = tk.StringVar(value="None")
         ttk.Label(rating_frame, text="Country:").pack(side=tk.LEFT) # noqa: E501
-        # Create a list of "CODE - Name" for display
-        country_display_list = sorted([f"{code.upper()} - {name}" for code, name in self.country_code_map.items()])
-
         country_combo = ttk.Combobox(
             rating_frame,
             textvariable=country_display_var, 
-            values=country_display_list
+            values=self._country_display_list
         )
 
         def on_country_select(event):
@@ -3850,8 +4669,23 @@ class HackDvbGui(tk.Tk):
         cancel_btn = ttk.Button(action_frame, text="Cancel", command=editor.destroy)
         cancel_btn.pack(side=tk.RIGHT, padx=10); ToolTip(cancel_btn, "Close the EPG editor without saving changes.")
         
-        # Bind search entry to filter the tree
-        search_var.trace_add("write", lambda *args: self.populate_epg_tree(tree, search_var.get()))
+        # Bind search entry to filter the tree. The rebuild waits until typing pauses,
+        # so a word typed quickly refilters once instead of once per keystroke.
+        filter_after_id = None
+
+        def apply_filter():
+            nonlocal filter_after_id
+            filter_after_id = None
+            if tree.winfo_exists():
+                self.populate_epg_tree(tree, search_var.get())
+
+        def schedule_filter(*args):
+            nonlocal filter_after_id
+            if filter_after_id:
+                tree.after_cancel(filter_after_id)
+            filter_after_id = tree.after(250, apply_filter)
+
+        search_var.trace_add("write", schedule_filter)
 
         self.populate_epg_tree(tree) # Initial population # noqa: E501
 
@@ -3869,28 +4703,6 @@ class HackDvbGui(tk.Tk):
         main_frame.grid_columnconfigure(1, weight=1)
         main_frame.grid_rowconfigure(1, weight=1)
 
-        # --- Data ---
-        l1_data = {
-            0x0: "Reserved for future use",
-            0x1: "Movie/Cinema",
-            0x2: "News/Current Affairs",
-            0x3: "Show/Entertainment",
-            0x4: "Sport",
-            0x5: "Children's/Youth Programs",
-            0x6: "Music/Ballet/Dance",
-            0x7: "Arts/Culture",
-            0x8: "Social/Political Issues/Economics",
-            0x9: "Education/Science/Factual Topics",
-            0xA: "Leisure/Hobbies",
-            0xB: "Special Characteristics",
-            0xC: "Adult Programs",
-            0xD: "User Defined",
-            0xE: "User Defined",
-            0xF: "User Defined"
-        }
-
-        l2_data = { 0x1: { 0x0: "Movie/Cinema (default)", 0x1: "Detective/Thriller", 0x2: "Adventure/Western", 0x3: "Sci-Fi/Fantasy", 0x4: "Comedy", 0x5: "Serious/Classical/Drama", 0x6: "Documentary", 0x7: "Various" }, 0x2: { 0x0: "News/Current Affairs (default)", 0x1: "News/Weather Report", 0x2: "News Magazine", 0x3: "Documentary/Reportage", 0x4: "Discussion/Interview/Debate", 0x5: "Various" }, 0x3: { 0x0: "Show/Entertainment (default)", 0x1: "Game Show/Quiz/Contest", 0x2: "Variety Show", 0x3: "Talk Show", 0x4: "Various" }, 0x4: { 0x0: "Sport (default)", 0x1: "Special Event (Olympics, World Cup)", 0x2: "Soccer/Football", 0x3: "Tennis/Squash", 0x4: "Team Sports (other)", 0x5: "Athletics", 0x6: "Motor Sport", 0x7: "Water Sport", 0x8: "Winter Sport", 0x9: "Horse Racing", 0xA: "Cycling", 0xB: "Various" }, 0x5: { 0x0: "Children's/Youth (default)", 0x1: "Pre-school", 0x2: "Entertainment (6-14 years)", 0x3: "Factual (6-14 years)", 0x4: "Young Teenagers", 0x5: "Teenagers", 0x6: "Various" }, 0x6: { 0x0: "Music/Ballet/Dance (default)", 0x1: "Rock/Pop", 0x2: "Serious Music (Classical)", 0x3: "Jazz", 0x4: "Musical/Opera", 0x5: "Folk/Traditional Music", 0x6: "Various" }, 0x7: { 0x0: "Arts/Culture (default)", 0x1: "Performing Arts", 0x2: "Fine Arts", 0x3: "Religion/Mythology/Folklore", 0x4: "Experimental Cinema/Video", 0x5: "Broadcasting/Press", 0x6: "New Media", 0x7: "Various/Feuilleton/Serial" }, 0x8: { 0x0: "Social/Political (default)", 0x1: "Magazines/Reports/Documentary", 0x2: "Discussion/Interview/Debate", 0x3: "Various" }, 0x9: { 0x0: "Education/Science (default)", 0x1: "Nature/Animals/Environment", 0x2: "Technology/Natural Sciences", 0x3: "Medicine/Health/Well Being", 0x4: "Foreign Countries/Expeditions", 0x5: "Various" }, 0xA: { 0x0: "Leisure/Hobbies (default)", 0x1: "Gardening", 0x2: "Cooking/Haute Cuisine", 0x3: "Travel/Tourism", 0x4: "Handicraft", 0x5: "Motoring", 0x6: "Fitness/Health", 0x7: "Various" }, 0xB: { 0x0: "Special Characteristics (default)", 0x1: "Adult Material/Pornography (deprecated)", 0x2: "Black and White", 0x3: "Unedited", 0x4: "Live Broadcast", 0x5: "Original Language", 0x6: "Explicit" }, 0xC: { 0x0: "Adult Programs/Pornography (default)" } }
-
         # --- Level 1 Tree ---
         ttk.Label(main_frame, text="Level 1 (Main Category)", style="Header.TLabel").grid(row=0, column=0, sticky='w')
         l1_tree = ttk.Treeview(main_frame, columns=("val", "desc"), show="headings", selectmode="browse")
@@ -3899,8 +4711,8 @@ class HackDvbGui(tk.Tk):
         l1_tree.column("val", width=50, anchor='center')
         l1_tree.grid(row=1, column=0, sticky='nsew', padx=(0, 5))
 
-        for val, desc in l1_data.items():
-            l1_tree.insert("", "end", values=(f"{val} (0x{val:X})", desc), iid=val)
+        for val, val_text, desc in _L1_ROWS:
+            l1_tree.insert("", "end", values=(val_text, desc), iid=val)
 
         # --- Level 2 Tree ---
         ttk.Label(main_frame, text="Level 2 (Sub-Category)", style="Header.TLabel").grid(row=0, column=1, sticky='w')
@@ -3912,18 +4724,17 @@ class HackDvbGui(tk.Tk):
 
         def on_l1_select(event):
             # Clear L2 tree
-            for item in l2_tree.get_children():
-                l2_tree.delete(item)
+            l2_tree.delete(*l2_tree.get_children())
 
             selected_item = l1_tree.focus()
             if not selected_item:
                 return
 
             l1_val = int(selected_item)
-            sub_cats = l2_data.get(l1_val)
-            if sub_cats:
-                for val, desc in sub_cats.items():
-                    l2_tree.insert("", "end", values=(f"{val} (0x{val:X})", desc))
+            sub_rows = _L2_ROWS.get(l1_val)
+            if sub_rows:
+                for row in sub_rows:
+                    l2_tree.insert("", "end", values=row)
             else:
                 l2_tree.insert("", "end", values=("", "No specific sub-categories defined"))
 
@@ -3950,16 +4761,17 @@ class HackDvbGui(tk.Tk):
             if path:
                 file_list.append(path)
         elif input_type == "Playlist":
-            file_list = channel.get("playlist_files", [])
+            file_list = list(channel.get("playlist_files", ())) # Snapshot; the playlist may change while probing
         elif input_type == "Concat File":
             concat_path = channel["input_path"].get()
             if not concat_path or not os.path.exists(concat_path):
                 messagebox.showerror("Error", "Concat file not found.", parent=self)
                 return
             try:
+                search = _CONCAT_LINE_RE.search
                 with open(concat_path, 'r', encoding='utf-8') as f:
                     for line in f:
-                        match = re.search(r"file\s+'(.+?)'", line)
+                        match = search(line)
                         if match:
                             file_list.append(match.group(1))
             except Exception as e:
@@ -3997,15 +4809,13 @@ class HackDvbGui(tk.Tk):
         # Language
         ttk.Label(options_frame, text="Language:").grid(row=0, column=0, sticky="w", pady=2)
         lang_display_var = tk.StringVar(value="English")
-        lang_display_names = sorted(self.language_map.keys())
-        lang_combo = ttk.Combobox(options_frame, textvariable=lang_display_var, values=lang_display_names, state="readonly")
+        lang_combo = ttk.Combobox(options_frame, textvariable=lang_display_var, values=self._lang_display_names, state="readonly")
         lang_combo.grid(row=0, column=1, sticky="ew")
 
         # Parental Rating Country
         ttk.Label(options_frame, text="Rating Country:").grid(row=1, column=0, sticky="w", pady=2)
         country_code_var = tk.StringVar(value="gbr")
-        country_display_list = sorted([f"{code.upper()} - {name}" for code, name in self.country_code_map.items()])
-        country_combo = ttk.Combobox(options_frame, values=country_display_list)
+        country_combo = ttk.Combobox(options_frame, values=self._country_display_list)
         country_combo.set("GBR - United Kingdom") # Set default
         country_combo.grid(row=1, column=1, sticky="ew")
 
@@ -4029,12 +4839,10 @@ class HackDvbGui(tk.Tk):
         nibble2_spinbox = ttk.Spinbox(content_type_frame, from_=0, to=15, textvariable=nibble2_var, width=5)
         nibble2_spinbox.pack(side=tk.LEFT)
 
-        user_start_time = None
-        user_options = {}
+        start_time_dialog.result = None # Set to (start_time, options) by on_ok
         def on_ok():
-            nonlocal user_start_time, user_options
             try:
-                user_start_time = datetime.strptime(f"{date_var.get()} {time_var.get()}", "%Y-%m-%d %H:%M")
+                start_time = _parse_dt(date_var.get(), time_var.get())
                 
                 # Get country code from selection
                 country_selection = country_combo.get()
@@ -4043,13 +4851,14 @@ class HackDvbGui(tk.Tk):
                 except IndexError:
                     selected_country_code = country_selection.lower()
 
-                user_options = {
+                options = {
                     "language": self.language_map.get(lang_display_var.get(), "eng"),
                     "country_code": selected_country_code,
                     "min_age": min_age_var.get(),
                     "nibble1": int(nibble1_var.get()),
                     "nibble2": int(nibble2_var.get())
                 }
+                start_time_dialog.result = (start_time, options)
                 start_time_dialog.destroy()
             except ValueError:
                 messagebox.showerror("Invalid Format", "Please use YYYY-MM-DD HH:MM format.", parent=start_time_dialog)
@@ -4057,47 +4866,61 @@ class HackDvbGui(tk.Tk):
         ttk.Button(dialog_frame, text="OK", command=on_ok).pack(side=tk.RIGHT, pady=(10,0))
         self.wait_window(start_time_dialog)
 
-        if user_start_time is None:
+        if start_time_dialog.result is None:
             return # User cancelled
+        user_start_time, user_options = start_time_dialog.result
 
         # --- 3. Process files and create events ---
-        self.status_label.config(text=f"Status: Generating EPG for {channel['name'].get()}...")
-        self.update() # Force GUI update
+        channel_name = channel['name'].get()
+        self.status_label.config(text=f"Status: Generating EPG for {channel_name}...")
+
+        def on_probed(durations):
+            new_events = []
+            current_time = user_start_time
+            for file_path, duration_sec in zip(file_list, durations):
+                base_name = os.path.basename(file_path)
+                if duration_sec is None:
+                    self.log_message(f"WARNING: Could not get duration for '{base_name}'. Skipping for EPG.\n")
+                    continue
 
-        new_events = []
-        current_time = user_start_time
-        for file_path in file_list:
-            duration_sec = self._get_media_duration(file_path)
-            if duration_sec is None:
-                self.log_message(f"WARNING: Could not get duration for '{os.path.basename(file_path)}'. Skipping for EPG.\n")
-                continue
+                end_time = current_time + timedelta(seconds=duration_sec)
+                file_name = os.path.splitext(base_name)[0]
+
+                event_data = {
+                    "channel": channel_name,
+                    "title": file_name.replace('_', ' ').replace('.', ' '),
+                    "start": current_time,
+                    "end": end_time,
+                    "language": user_options.get("language", "eng"),
+                    "short_desc": "Auto-generated event.",
+                    "ext_desc": f"Playing file: {base_name}",
+                    "nibble1": user_options.get("nibble1", 15), "nibble2": user_options.get("nibble2", 0), "ca_mode": False,
+                    "country_code": user_options.get("country_code", "gbr"), "min_age": user_options.get("min_age", "None")
+                }
+                new_events.append(event_data)
+                current_time = end_time # Set start time for next event
 
-            end_time = current_time + timedelta(seconds=duration_sec)
-            file_name = os.path.splitext(os.path.basename(file_path))[0]
-
-            event_data = {
-                "channel": channel['name'].get(),
-                "title": file_name.replace('_', ' ').replace('.', ' '),
-                "start": current_time,
-                "end": end_time,
-                "language": user_options.get("language", "eng"),
-                "short_desc": "Auto-generated event.",
-                "ext_desc": f"Playing file: {os.path.basename(file_path)}",
-                "nibble1": user_options.get("nibble1", 15), "nibble2": user_options.get("nibble2", 0), "ca_mode": False,
-                "country_code": user_options.get("country_code", "gbr"), "min_age": user_options.get("min_age", "None")
-            }
-            new_events.append(event_data)
-            current_time = end_time # Set start time for next event
+            self.epg_events.extend(new_events)
+            self._epg_titles_lc = None
+            self.status_label.config(text="Status: Idle")
 
-        self.epg_events.extend(new_events)
-        self.status_label.config(text="Status: Idle")
+            # Immediately save the generated events to a temp XML and update the path
+            self._generate_and_save_epg_xml()
 
-        # Immediately save the generated events to a temp XML and update the path
-        self._generate_and_save_epg_xml()
+            messagebox.showinfo("EPG Generated",
+                                f"Successfully generated and added {len(new_events)} events for channel '{channel_name}'.\n\n"
+                                "You can view and edit them in the 'EPG Editor'.", parent=self)
 
-        messagebox.showinfo("EPG Generated",
-                            f"Successfully generated and added {len(new_events)} events for channel '{channel['name'].get()}'.\n\n"
-                            "You can view and edit them in the 'EPG Editor'.", parent=self)
+        def probe():
+            # Probe the files concurrently; each ffprobe run is mostly process start-up and I/O wait
+            with ThreadPoolExecutor(max_workers=min(8, len(file_list)), thread_name_prefix="duration") as executor:
+                durations = list(executor.map(self._get_media_duration, file_list))
+            self.after(0, on_probed, durations)
+
+        # Resolve ffprobe here, as it reads a Tk variable. The probes run on a separate thread so the
+        # GUI thread is never blocked waiting on workers that may need it (e.g. to log a failure).
+        self._resolve_ffprobe()
+        threading.Thread(target=probe, daemon=True).start()
 
     def clear_epg_form(self, editor, clear_channel=True):
         """Clears all fields in the EPG editor form and resets the selection."""
@@ -4130,18 +4953,49 @@ class HackDvbGui(tk.Tk):
 
     def populate_epg_tree(self, tree, filter_text=""):
         """Clears and repopulates the EPG event treeview."""
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Filter events based on the search text
-        filtered_events = self.epg_events
-        if filter_text:
-            filtered_events = [e for e in self.epg_events if filter_text.lower() in e.get('title', '').lower()]
+        children = tree.get_children()
+        if children:
+            tree.delete(*children) # One Tcl call for all rows
 
-        # Sort events by start time
-        sorted_events = sorted(filtered_events, key=lambda x: x['start'])
-        for i, event in enumerate(sorted_events):
-            tree.insert("", tk.END, iid=self.epg_events.index(event), values=(event['channel'], event['title'], event['start'].strftime("%Y-%m-%d %H:%M")))
+        # Filter events based on the search text. Each row's iid is the event's index in
+        # self.epg_events, carried along from enumerate() rather than searched for.
+        events = self.epg_events
+        if filter_text:
+            # Titles are lowercased once per change to the events, not on every keystroke
+            titles_lc = self._epg_titles_lc
+            if titles_lc is None:
+                titles_lc = self._epg_titles_lc = [e.get('title', '').lower() for e in events]
+            filter_lc = filter_text.lower()
+            indexed_events = [(i, events[i]) for i, title_lc in enumerate(titles_lc) if filter_lc in title_lc]
+        else:
+            indexed_events = list(enumerate(events))
+
+        # Sort events by start time. Only the first page is inserted now; long schedules would
+        # otherwise spend most of the editor's refresh time creating rows nobody scrolls to.
+        indexed_events.sort(key=lambda ie: ie[1]['start'])
+        tree.epg_sorted = indexed_events
+        tree.epg_loaded = 0
+        self._load_epg_tree_page(tree)
+
+    def _load_epg_tree_page(self, tree):
+        """Inserts the next page of filtered events into the EPG treeview."""
+        tree.epg_page_pending = False
+        if not tree.winfo_exists():
+            return # The editor was closed before a scheduled page load ran
+        start = tree.epg_loaded
+        page = tree.epg_sorted[start:start + self._EPG_TREE_PAGE]
+        tree.epg_loaded = start + len(page)
+        # Call Tcl's insert directly: Treeview.insert() re-processes its options for every row
+        tk_call, tree_path = tree.tk.call, str(tree)
+        for i, event in page:
+            tk_call(tree_path, "insert", "", "end", "-iid", i,
+                    "-values", (event['channel'], event['title'], event['start'].strftime("%Y-%m-%d %H:%M")))
+
+    def _on_epg_tree_scroll(self, tree, last):
+        """Loads more EPG rows once the view reaches the last tenth of the inserted ones."""
+        if float(last) > 0.9 and tree.epg_loaded < len(tree.epg_sorted) and not tree.epg_page_pending:
+            tree.epg_page_pending = True
+            tree.after_idle(self._load_epg_tree_page, tree)
 
     def add_epg_event(self, editor, channel, title, short_desc, lang_display, date_str, time_str, dur_h, dur_m, ext_desc, nibble1, nibble2, ca_mode, country_code, min_age):
         """Validates and adds or updates an event in the internal list."""
@@ -4149,7 +5003,7 @@ class HackDvbGui(tk.Tk):
             messagebox.showerror("Missing Info", "Please fill all fields.", parent=editor)
             return
         try:
-            start_time = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+            start_time = _parse_dt(date_str, time_str)
             duration_minutes = int(dur_h) * 60 + int(dur_m)
             
             # Add validation for max duration (3 hours = 180 minutes)
@@ -4181,9 +5035,13 @@ class HackDvbGui(tk.Tk):
         if editor.selected_event_index is not None:
             # Update existing event
             self.epg_events[editor.selected_event_index] = event_data
+            if self._epg_titles_lc is not None:
+                self._epg_titles_lc[editor.selected_event_index] = title.lower()
         else:
             # Add new event
             self.epg_events.append(event_data)
+            if self._epg_titles_lc is not None:
+                self._epg_titles_lc.append(title.lower())
 
         # Reset selection and repopulate tree
         editor.selected_event_index = None
@@ -4197,17 +5055,17 @@ class HackDvbGui(tk.Tk):
         form['short_desc'].set(event_data.get('short_desc', ''))
 
         lang_code = event_data.get('language', 'eng')
-        lang_display_name = next((name for name, code in self.language_map.items() if code == lang_code), "English")
+        lang_display_name = self._lang_code_to_display.get(lang_code, "English")
         form['language_display'].set(lang_display_name)
 
         form['date'].set(event_data['start'].strftime("%Y-%m-%d"))
         form['time'].set(event_data['start'].strftime("%H:%M"))
 
         duration = event_data['end'] - event_data['start']
-        total_minutes = duration.total_seconds() // 60
+        total_minutes = duration.days * 1440 + duration.seconds // 60 # Integer math, no float round-trip
         hours, minutes = divmod(total_minutes, 60)
-        form['dur_h'].set(str(int(hours)))
-        form['dur_m'].set(str(int(minutes)))
+        form['dur_h'].set(str(hours))
+        form['dur_m'].set(str(minutes))
 
         form['ext_desc'].delete("1.0", tk.END)
         form['ext_desc'].insert("1.0", event_data.get('ext_desc', ''))
@@ -4237,6 +5095,7 @@ class HackDvbGui(tk.Tk):
         
         # The IID of the tree item is its index in the original self.epg_events list.
         del self.epg_events[int(selected_item)]
+        self._epg_titles_lc = None
 
         # Crucially, reset the selected index so we don't try to update a deleted item
         editor.selected_event_index = None
@@ -4291,7 +5150,7 @@ class HackDvbGui(tk.Tk):
             
             if messagebox.askyesno("EPG Gap Warning", warning_msg, parent=editor_window):
                 self.epg_events = new_event_list # Replace original events with the gap-filled list
-                self.populate_epg_tree(editor_window.tree) # Refresh the tree view to show fillers
+                self._epg_titles_lc = None
                 self.log_message(f"INFO: Filled {len(gaps_found)} EPG gap(s).\n")
             else:
                 return # User chose not to proceed, so we return to the editor.
@@ -4300,6 +5159,9 @@ class HackDvbGui(tk.Tk):
             editor_window.destroy()
         else:
             # An error occurred, show it to the user but keep the editor open.
+            # The tree is only refreshed here (to show any fillers), since on success it is destroyed anyway.
+            if gaps_found:
+                self.populate_epg_tree(editor_window.tree)
             messagebox.showerror("File Error", "Could not write temporary EPG file. Check logs for details.", parent=editor_window)
 
     def _detect_and_fill_epg_gaps(self):
@@ -4332,17 +5194,7 @@ class HackDvbGui(tk.Tk):
                     gap_end = next_event['start']
                     gaps_found.append({'channel': ch_name, 'start': gap_start, 'end': gap_end})
 
-                    filler_event = {
-                        "channel": ch_name,
-                        "title": "To Be Announced",
-                        "start": gap_start,
-                        "end": gap_end,
-                        "language": "eng",
-                        "short_desc": "Information not available.",
-                        "ext_desc": "",
-                        "nibble1": 15, "nibble2": 0, "ca_mode": False,
-                        "country_code": "gbr", "min_age": "None"
-                    }
+                    filler_event = {**_FILLER_TEMPLATE, "channel": ch_name, "start": gap_start, "end": gap_end}
                     all_events_with_fillers.append(filler_event)
                 
                 all_events_with_fillers.append(next_event)
@@ -4352,32 +5204,24 @@ class HackDvbGui(tk.Tk):
     def _generate_event_xml(self, event, event_id, is_running):
         """Helper to generate the XML for a single event."""
         start_str = event['start'].strftime("%Y-%m-%d %H:%M:%S")
-        total_seconds = int((event['end'] - event['start']).total_seconds())
+        duration = event['end'] - event['start']
+        total_seconds = duration.days * 86400 + duration.seconds
         hours, remainder = divmod(total_seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         ca_mode_str = "true" if event.get("ca_mode", False) else "false"
         duration_str = f"{hours:02}:{minutes:02}:{seconds:02}"
         running_status = "running" if is_running else "not-running"
-        
-        escaped_title = xml.sax.saxutils.escape(event.get("title", ""))
-        escaped_short_desc = xml.sax.saxutils.escape(event.get("short_desc", ""))
-        escaped_ext_desc = xml.sax.saxutils.escape(event.get("ext_desc", ""))
-        nibble1 = event.get("nibble1", 15)
+
+        escaped_ext_desc = _xml_escape(event.get("ext_desc", ""))
         language_code = event.get("language", "eng")
-        nibble2 = event.get("nibble2", 0)
         country_code = event.get("country_code")
         min_age = event.get("min_age")
 
-        xml_parts = [
-            f'    <event event_id="{event_id}" start_time="{start_str}" duration="{duration_str}" running_status="{running_status}" CA_mode="{ca_mode_str}">\n'
-            f'      <content_descriptor>\n'
-            f'        <content content_nibble_level_1="{nibble1}" content_nibble_level_2="{nibble2}" user_byte="0x00"/>\n'
-            f'      </content_descriptor>\n'
-            f'      <short_event_descriptor language_code="{language_code}">\n'
-            f'        <event_name>{escaped_title}</event_name>\n'
-            f'        <text>{escaped_short_desc}</text>\n'
-            f'      </short_event_descriptor>\n'
-        ]
+        xml_parts = [_EVENT_XML_HEAD % (
+            event_id, start_str, duration_str, running_status, ca_mode_str,
+            event.get("nibble1", 15), event.get("nibble2", 0),
+            language_code, _xml_escape(event.get("title", "")), _xml_escape(event.get("short_desc", "")),
+        )]
 
         # Add parental rating descriptor if age is specified
         if country_code and min_age and min_age != "None":
@@ -4385,20 +5229,14 @@ class HackDvbGui(tk.Tk):
                 # DVB rating = age - 3. 0x00 is undefined. 0x01-0x0F for ages 4-18.
                 rating_val = int(min_age) - 3
                 if 1 <= rating_val <= 15:
-                    xml_parts.append(f'      <parental_rating_descriptor>\n')
-                    xml_parts.append(f'        <country country_code="{country_code}" rating="0x{rating_val:02X}"/>\n')
-                    xml_parts.append(f'      </parental_rating_descriptor>\n')
+                    xml_parts.append(_PARENTAL_XML % (country_code, rating_val))
             except (ValueError, TypeError):
                 pass # Ignore if min_age is not a valid integer
         # Add extended event descriptor if a description exists
         if escaped_ext_desc:
-            xml_parts.append(
-                f'      <extended_event_descriptor descriptor_number="0" last_descriptor_number="0" language_code="{language_code}">\n'
-                f'        <text>{escaped_ext_desc}</text>\n'
-                f'      </extended_event_descriptor>\n'
-            )
+            xml_parts.append(_EXT_DESC_XML % (language_code, escaped_ext_desc))
 
-        xml_parts.append('    </event>')
+        xml_parts.append(_EVENT_XML_TAIL)
         return "".join(xml_parts)
 
     def _generate_and_save_epg_xml(self):
@@ -4411,14 +5249,14 @@ class HackDvbGui(tk.Tk):
             self.update_command_preview()
             return None
 
-        xml_content = self._build_eit_xml()
         try:
             # Create a temporary file, close it so other processes can access it, then write to it.
             tmp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.xml', encoding='utf-8')
             tmp_file_path = tmp_file.name
             tmp_file.close()
-            with open(tmp_file_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+            # Stream the XML line by line rather than building the whole document in memory
+            with open(tmp_file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.writelines(self._iter_eit_xml())
 
             self.eit_path.set(tmp_file_path)
             self.log_message(f"Generated temporary EPG file at: {self.eit_path.get()}\n")
@@ -4428,20 +5266,23 @@ class HackDvbGui(tk.Tk):
             self.log_message(f"ERROR: Could not write temporary EPG file: {e}\n")
             return None
 
-    def _build_eit_xml(self):
-        """Builds the TSDuck-compatible EIT XML string from self.epg_events."""
-        xml_parts = ['<?xml version="1.0" encoding="UTF-8"?>', '<tsduck>']
+    def _iter_eit_xml(self):
+        """Yields the TSDuck-compatible EIT XML for self.epg_events, one newline-terminated chunk at a time."""
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<tsduck>\n'
 
-        # Find channel PID mapping
-        channel_pids = {ch['name'].get(): ch['pid'].get() for ch in self.channels}
+        # Group the events by channel in one pass
+        events_by_channel = {}
+        for event in self.epg_events:
+            events_by_channel.setdefault(event['channel'], []).append(event)
 
         # Generate one EIT section per channel
         for ch_data in self.channels:
             ch_name = ch_data['name'].get()
             service_id_hex = ch_data['pid'].get()
 
-            # Filter events for the current channel
-            channel_events = sorted([e for e in self.epg_events if e['channel'] == ch_name], key=lambda x: x['start'])
+            # Events for the current channel
+            channel_events = sorted(events_by_channel.get(ch_name, ()), key=lambda x: x['start'])
             if not channel_events:
                 continue # Skip channels with no events
 
@@ -4451,19 +5292,19 @@ class HackDvbGui(tk.Tk):
 
             # The new format seems to be a single "pf" (Present/Following) table per service.
             # We will populate it with all events for that service.
-            xml_parts.append(f'  <EIT type="pf" version="0" actual="true" service_id="{service_id_hex}" transport_stream_id="0x0001" original_network_id="0x0001" last_table_id="0x4E">')
+            yield f'  <EIT type="pf" version="0" actual="true" service_id="{service_id_hex}" transport_stream_id="0x0001" original_network_id="0x0001" last_table_id="0x4E">\n'
 
             # Use a simple counter for event_id, starting from a base for uniqueness.
             event_id_base = 10000
             for i, event in enumerate(channel_events):
                 event_id = event_id_base + i
-                is_running = (event == p_event)
-                xml_parts.append(self._generate_event_xml(event, event_id, is_running))
+                is_running = event is p_event # p_event is one of channel_events
+                yield self._generate_event_xml(event, event_id, is_running)
+                yield '\n'
 
-            xml_parts.append('  </EIT>')
+            yield '  </EIT>\n'
 
-        xml_parts.append('</tsduck>')
-        return '\n'.join(xml_parts)
+        yield '</tsduck>\n'
 
 if __name__ == "__main__":
 